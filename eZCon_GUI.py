@@ -1,17 +1,33 @@
 #!/usr/bin/env python3
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, simpledialog
 import tkinter.ttk as ttk
-import subprocess
+import asyncio
+import locale
 import os
 import sys
 import threading
 import time
 import shutil
-from datetime import datetime
+import zipfile
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 import re
+import functools
+import ctypes
+import tempfile
+from collections import OrderedDict, deque
+import json
+import hashlib
+import queue
+import io
+import http.server
+import urllib.parse
+import numpy as np
 from PIL import Image, ImageTk
 from astropy.coordinates import SkyCoord, AltAz, EarthLocation
+from astropy.time import Time
 from astropy import units as u
 
 # ---------------- Global Settings ----------------
@@ -295,10 +311,11 @@ def menu_ezcon_help():
     help_text_widget.config(state=tk.DISABLED)
 
 # ---------------- Functions for Reading Defaults ----------------
-def read_defaults():
+def read_defaults(defaults_file=None):
     """Reads ezDefaults.txt (ignoring comments) and returns a dict mapping keys to values."""
     defaults = {}
-    defaults_file = os.path.join(WORKING_DIR, "ezDefaults.txt")
+    if defaults_file is None:
+        defaults_file = os.path.join(WORKING_DIR, "ezDefaults.txt")
     if os.path.exists(defaults_file):
         with open(defaults_file, "r") as f:
             for line in f:
@@ -374,7 +391,18 @@ def save_settings_as():
 
 def _save_settings_to_file(settings_file):
     """Helper function to write settings to the specified file."""
-    settings = {"WORKING_DIR": working_dir_var.get().strip()}
+    settings = {"WORKING_DIR": working_dir_var.get().strip(),
+                "PLOT_SELECTION": " ".join(str(n) for n in plot_selection),
+                "PLOT_SELECTION_ACTIVE": plot_selection_active,
+                "PLOT_MAX_INVOCATIONS": plot_max_invocations,
+                "OPTIMIZE_PNG": optimize_png_var.get(),
+                "AUTO_ARCHIVE": auto_archive_var.get(),
+                "ARCHIVE_AFTER_DAYS": archive_after_days,
+                "MAX_PARALLEL_JOBS": max_parallel_jobs,
+                "MEMORY_RESERVE_MB": memory_reserve_mb,
+                "STATUS_SERVER_ACTIVE": status_server_active,
+                "STATUS_SERVER_HOST": status_server_host,
+                "STATUS_SERVER_PORT": status_server_port}
     for key in advanced_options:
         settings[key] = advanced_options.get(key, "")
         settings[key + "_active"] = advanced_options_active.get(key, False)
@@ -389,7 +417,9 @@ def _save_settings_to_file(settings_file):
 
 def load_settings():
     """Load settings from ezconguiset.txt in WORKING_DIR and update the working directory and advanced options."""
-    global WORKING_DIR
+    global WORKING_DIR, plot_selection, plot_selection_active, plot_max_invocations, archive_after_days
+    global max_parallel_jobs, memory_reserve_mb
+    global status_server_active, status_server_host, status_server_port
     settings_file = os.path.join(WORKING_DIR, "ezconguiset.txt")
     try:
         with open(settings_file, "r") as f:
@@ -403,6 +433,28 @@ def load_settings():
                 if key == "WORKING_DIR":
                     working_dir_var.set(value)
                     WORKING_DIR = value
+                elif key == "PLOT_SELECTION":
+                    plot_selection = parse_plot_numbers(value)
+                elif key == "PLOT_SELECTION_ACTIVE":
+                    plot_selection_active = (value.lower() in ["true", "1", "yes"])
+                elif key == "PLOT_MAX_INVOCATIONS":
+                    plot_max_invocations = max(1, int(value)) if value.isdigit() else 4
+                elif key == "OPTIMIZE_PNG":
+                    optimize_png_var.set(value.lower() in ["true", "1", "yes"])
+                elif key == "AUTO_ARCHIVE":
+                    auto_archive_var.set(value.lower() in ["true", "1", "yes"])
+                elif key == "ARCHIVE_AFTER_DAYS":
+                    archive_after_days = int(value) if value.isdigit() else archive_after_days
+                elif key == "MAX_PARALLEL_JOBS":
+                    max_parallel_jobs = max(1, int(value)) if value.isdigit() else max_parallel_jobs
+                elif key == "MEMORY_RESERVE_MB":
+                    memory_reserve_mb = int(value) if value.isdigit() else memory_reserve_mb
+                elif key == "STATUS_SERVER_ACTIVE":
+                    status_server_active = (value.lower() in ["true", "1", "yes"])
+                elif key == "STATUS_SERVER_HOST":
+                    status_server_host = value or status_server_host
+                elif key == "STATUS_SERVER_PORT":
+                    status_server_port = int(value) if value.isdigit() else status_server_port
                 else:
                     if key.endswith("_active"):
                         real_key = key[:-7]
@@ -416,41 +468,160 @@ def load_settings():
 # ---------------- Debug Output ----------------
 def log_debug(msg):
     """Append a message to the debug text widget."""
+    with status_lock:
+        log_tail.append(time.strftime("%H:%M:%S ") + msg)
     debug_text.config(state=tk.NORMAL)
     debug_text.insert(tk.END, msg + "\n")
     debug_text.see(tk.END)
     debug_text.config(state=tk.DISABLED)
 
-def read_stream(stream, prefix=""):
-    """Read lines from a stream and update the debug window."""
-    for line in iter(stream.readline, ''):
-        if line:
-            if not DEBUG_MODE:
-                if prefix.startswith("STDOUT:") or prefix.startswith("STDERR:"):
-                    continue
-            else:
-                if prefix.startswith("STDOUT:") and not show_stdout_var.get():
-                    continue
-                if prefix.startswith("STDERR:") and not show_stderr_var.get():
-                    continue
-            root.after(0, log_debug, prefix + line.rstrip())
-    stream.close()
+def log_stream_line(prefix, line):
+    """Show one line of ezCon output in the debug window, if its stream is enabled."""
+    if prefix.startswith("STDOUT:") and not show_stdout_var.get():
+        return
+    if prefix.startswith("STDERR:") and not show_stderr_var.get():
+        return
+    log_debug(prefix + line)
+
+# ---------------- Process Supervisor ----------------
+# All ezCon child processes are supervised by one asyncio event loop running in one
+# background thread, which reads every child's stdout/stderr and waits for its exit.
+# Anything for the GUI goes through ui_queue and runs on the Tk thread, because Tk
+# must only be used from the thread that created it.
+STREAM_LINE_LIMIT = 1024 * 1024  # Longest ezCon output line read in one piece
+UI_QUEUE_INTERVAL_MS = 50
+ui_queue = queue.Queue()
+supervisor_loop = None
+post_run_executor = ThreadPoolExecutor(max_workers=2)  # Moves outputs and runs the post-run pipeline
+
+def call_in_ui(func, *args):
+    """Run func(*args) on the Tk thread. Safe to call from any thread."""
+    ui_queue.put((func, args))
+
+def process_ui_queue():
+    """Run the calls queued by other threads, then check again shortly."""
+    try:
+        while True:
+            func, args = ui_queue.get_nowait()
+            try:
+                func(*args)
+            except Exception as e:
+                log_debug("Error in " + getattr(func, "__name__", "callback") + ": " + str(e))
+    except queue.Empty:
+        pass
+    root.after(UI_QUEUE_INTERVAL_MS, process_ui_queue)
+
+def start_supervisor():
+    """Start the asyncio event loop thread that supervises the ezCon processes."""
+    global supervisor_loop
+    supervisor_loop = asyncio.new_event_loop()
+    if sys.platform != "win32" and sys.version_info < (3, 12) and hasattr(asyncio, "PidfdChildWatcher"):
+        # The default watcher before 3.12 starts one thread per child; pidfd needs none.
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+            watcher = asyncio.PidfdChildWatcher()
+            watcher.attach_loop(supervisor_loop)
+            asyncio.set_child_watcher(watcher)
+        except (AttributeError, OSError):
+            pass
+    threading.Thread(target=supervisor_loop.run_forever, name="ezcon-supervisor", daemon=True).start()
+
+async def pump_stream(stream, prefix, job=None):
+    """Forward the lines of one child pipe to the debug window and note the ezCon revision in job."""
+    encoding = locale.getpreferredencoding(False)
+    while True:
+        try:
+            line = await stream.readline()
+        except ValueError:
+            # A line longer than STREAM_LINE_LIMIT is dropped by readline().
+            continue
+        if not line:
+            break
+        text = line.decode(encoding, errors="replace").rstrip()
+        if job is not None and "revision" not in job:
+            match = REVISION_RE.search(text)
+            if match:
+                job["revision"] = match.group(1)
+        if DEBUG_MODE:
+            call_in_ui(log_stream_line, prefix, text)
+
+async def supervise_job(job):
+    """Run one ezCon process to completion and report its exit to the Tk thread."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *job["cmd"],
+            cwd=job["cwd"],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LINE_LIMIT
+        )
+    except Exception as e:
+        call_in_ui(log_debug, "Exception while running subprocess: " + str(e))
+        call_in_ui(job_finished, job, -1)
+        return
+    job["pid"] = process.pid
+    handle = open_process_handle(process.pid)
+    sampler = asyncio.ensure_future(sample_peak_memory(job, handle))
+    await asyncio.gather(pump_stream(process.stdout, "STDOUT: ", job),
+                         pump_stream(process.stderr, "STDERR: "))
+    # The pipes close when ezCon exits; on Linux VmHWM is gone once the process is reaped.
+    update_peak_memory(job, handle)
+    returncode = await process.wait()
+    sampler.cancel()
+    # On Windows the open handle keeps the counters readable after the exit.
+    update_peak_memory(job, handle)
+    close_process_handle(handle)
+    call_in_ui(job_finished, job, returncode)
+
+def update_peak_memory(job, handle=None):
+    peak = process_peak_memory_mb(job["pid"], handle)
+    if peak:
+        job["peak_mb"] = max(job["peak_mb"], peak)
+
+async def sample_peak_memory(job, handle):
+    """Read the job's peak memory while it runs, so the scheduler sees its growth."""
+    while True:
+        update_peak_memory(job, handle)
+        await asyncio.sleep(PEAK_SAMPLE_SECONDS)
 
 # ---------------- Build Command Line ----------------
-def build_command_line(data_file_rel, ezcon_path_norm):
+def build_command_line(data_file_rel, ezcon_path_norm, plot_range=None):
     """
     Build and return the command line as a list to run ezCon.py.
     Append any active advanced option (key and its tokenized value).
+    If plot_range (start, end) is given it replaces any -ezConPlotRangeL option.
     """
     cmd = [sys.executable, ezcon_path_norm, data_file_rel]
     for key in advanced_options:
+        if plot_range is not None and key == "-ezConPlotRangeL":
+            continue
         if advanced_options_active.get(key, False):
             val = advanced_options.get(key, "").strip()
             if val:
                 cmd.append(key)
                 cmd.extend(val.split())
+    if plot_range is not None:
+        cmd.extend(["-ezConPlotRangeL", str(plot_range[0]), str(plot_range[1])])
     return cmd
 
+def current_plot_ranges():
+    """Return the planned plot ranges for the current plot selection, or None if it is off."""
+    if plot_selection_active and plot_selection:
+        return plan_plot_ranges(plot_selection, known_plots(), plot_max_invocations)
+    return None
+
+def build_command_lines(data_file_rel, ezcon_path_norm, ranges=None):
+    """
+    Build the list of ezCon command lines for one data file.
+    With the plot selection active, there is one command line per planned plot range.
+    ranges may be passed in when many files share one plan (see start_batch).
+    """
+    if ranges is None:
+        ranges = current_plot_ranges()
+    if ranges:
+        return [build_command_line(data_file_rel, ezcon_path_norm, r) for r in ranges]
+    return [build_command_line(data_file_rel, ezcon_path_norm)]
+
 # ---------------- Command Line Preview ----------------
 def update_cmd_preview():
     """Update the command line preview text widget on the main window."""
@@ -468,16 +639,9 @@ def update_cmd_preview():
         cmd_preview_text.insert(tk.END, "ezCon.py not found.")
         cmd_preview_text.config(state=tk.DISABLED)
         return
-    abs_working = os.path.abspath(WORKING_DIR)
-    abs_file = os.path.abspath(data_file)
-    if abs_file.startswith(abs_working):
-        data_file_rel = os.path.relpath(data_file, WORKING_DIR)
-    else:
-        data_file_rel = data_file
-    data_file_rel = os.path.normpath(data_file_rel)
-    ezcon_path_norm = os.path.normpath(ezcon_path)
-    cmd = build_command_line(data_file_rel, ezcon_path_norm)
-    preview_str = " ".join(cmd)
+    # The same command lines start_run runs in the job's work directory.
+    cmds = build_run_command_lines(data_file)
+    preview_str = "\n".join(" ".join(cmd) for cmd in cmds)
     cmd_preview_text.config(state=tk.NORMAL)
     cmd_preview_text.delete("1.0", tk.END)
     cmd_preview_text.insert(tk.END, preview_str)
@@ -506,6 +670,7 @@ def update_thumbnails():
         if os.path.exists(fpath):
             try:
                 img = Image.open(fpath)
+                cache_status_thumbnail(fname, img)
                 img.thumbnail((100, 100))
                 photo = ImageTk.PhotoImage(img)
                 thumbnail_images.append(photo)
@@ -517,6 +682,666 @@ def update_thumbnails():
         else:
             tk.Label(frame, text=fname+"\n(Not found)", wraplength=100, fg="red").pack()
 
+# ---------------- Plot Selection ----------------
+# ezCon plot files are named "ezCon" + 3 digit plot number + plot name, e.g. ezCon114antBAvg.png.
+PLOT_NUMBER_RE = re.compile(r'^ezCon(\d{3})\D.*\.png$', re.IGNORECASE)
+plot_selection = [114, 247, 282, 301]  # Selected ezCon plot numbers (the thumbnails by default)
+plot_selection_active = False          # Only render the selected plots
+plot_max_invocations = 4               # Maximum number of parallel ezCon invocations per data file
+PLOT_COST = 1                          # Relative cost of rendering one plot
+EZCON_PASS_COST = 4                    # Relative cost of an extra ezCon pass (reading and processing the data)
+
+def plot_number(fname):
+    """Return the ezCon plot number of a .png file name, or None."""
+    match = PLOT_NUMBER_RE.match(fname)
+    return int(match.group(1)) if match else None
+
+def parse_plot_numbers(text):
+    """Parse a string of plot numbers separated by spaces or commas into a sorted list."""
+    numbers = set()
+    for token in text.replace(",", " ").split():
+        if token.isdigit():
+            numbers.add(int(token))
+    return sorted(numbers)
+
+known_plots_cache = {"dir": None, "plots": {}}  # Scanned once per working directory (Tk thread only)
+
+def known_plots():
+    """
+    Return a dict mapping ezCon plot numbers to plot file names.
+    The run folders are only scanned the first time for a working directory;
+    learn_plots adds the plots of later runs.
+    """
+    if known_plots_cache["dir"] != WORKING_DIR:
+        known_plots_cache["plots"] = scan_known_plots()
+        known_plots_cache["dir"] = WORKING_DIR
+    return known_plots_cache["plots"]
+
+def learn_plots(file_names):
+    """Add the plots a run moved to its output folder to the known plots."""
+    for fname in file_names:
+        number = plot_number(fname)
+        if number is not None:
+            known_plots().setdefault(number, fname)
+
+def scan_known_plots():
+    """
+    Return a dict mapping ezCon plot numbers to plot file names.
+    Plots are learned from THUMBNAIL_FILES, the working directory and earlier run folders.
+    """
+    plots = {}
+    output_root = os.path.join(WORKING_DIR, "EZCONPNG_FILES")
+    folders = [WORKING_DIR] + [os.path.join(output_root, name) for name in list_run_folders()]
+    for folder in folders:
+        try:
+            for entry in os.scandir(folder):
+                number = plot_number(entry.name)
+                if number is not None:
+                    plots.setdefault(number, entry.name)
+        except OSError:
+            continue
+    for fname in THUMBNAIL_FILES:
+        plots[plot_number(fname)] = fname
+    return plots
+
+def plan_plot_ranges(selected, known, max_invocations=1):
+    """
+    Compute the -ezConPlotRangeL ranges (start, end) covering the selected plot numbers.
+    A range is only split where a known, unselected plot lies between two selected plots.
+    Neighbouring ranges are merged while the unselected plots in the gap cost less than an
+    extra ezCon pass (see PLOT_COST / EZCON_PASS_COST). If there are still more ranges than
+    max_invocations, the neighbouring ranges with the fewest unselected plots between them
+    are merged. While no unselected plots are known yet, every plot number in a gap is
+    assumed to be a plot.
+    """
+    selected = sorted(set(selected))
+    if not selected:
+        return []
+    unwanted = sorted(set(known) - set(selected))
+
+    def unwanted_between(low, high):
+        if not unwanted:
+            return high - low - 1
+        return sum(1 for n in unwanted if low < n < high)
+
+    def gap_cost(i):
+        return (unwanted_between(ranges[i][1], ranges[i + 1][0]),
+                ranges[i + 1][0] - ranges[i][1])
+
+    def merge(i):
+        ranges[i][1] = ranges[i + 1][1]
+        del ranges[i + 1]
+
+    ranges = [[selected[0], selected[0]]]
+    for number in selected[1:]:
+        if unwanted_between(ranges[-1][1], number):
+            ranges.append([number, number])
+        else:
+            ranges[-1][1] = number
+    while len(ranges) > 1:
+        i = min(range(len(ranges) - 1), key=gap_cost)
+        if gap_cost(i)[0] * PLOT_COST >= EZCON_PASS_COST:
+            break
+        merge(i)
+    while len(ranges) > max(1, max_invocations):
+        merge(min(range(len(ranges) - 1), key=gap_cost))
+    return [tuple(r) for r in ranges]
+
+def unwanted_plots_in_ranges(ranges, selected, known):
+    """Return how many known, unselected plots each range (start, end) renders as well."""
+    unwanted = set(known) - set(selected)
+    return [sum(1 for n in unwanted if start <= n <= end) for start, end in ranges]
+
+def open_plot_selection_dialog():
+    """Open a window to choose which ezCon plots are rendered."""
+    sel_win = tk.Toplevel(root)
+    sel_win.title("Plot Selection")
+    sel_win.geometry("500x600")
+    sel_win.grab_set()
+
+    plots = dict(known_plots())
+    active_var = tk.BooleanVar(value=plot_selection_active)
+    tk.Checkbutton(sel_win, text="Only render the selected plots", variable=active_var).pack(anchor=tk.W, padx=5, pady=5)
+
+    list_frame = tk.LabelFrame(sel_win, text="Known ezCon plots", padx=5, pady=5)
+    list_frame.pack(fill=tk.BOTH, expand=True, padx=5)
+    scroll = create_scrollable_frame(list_frame)
+    check_vars = {}
+    for number in sorted(plots):
+        var = tk.BooleanVar(value=number in plot_selection)
+        check_vars[number] = var
+        tk.Checkbutton(scroll, text=plots[number], variable=var, anchor="w").pack(fill=tk.X)
+
+    extra_frame = tk.Frame(sel_win)
+    extra_frame.pack(fill=tk.X, padx=5, pady=2)
+    tk.Label(extra_frame, text="Additional plot numbers:", width=25, anchor="w").pack(side=tk.LEFT)
+    extra_var = tk.StringVar(value=" ".join(str(n) for n in plot_selection if n not in plots))
+    tk.Entry(extra_frame, textvariable=extra_var, width=25).pack(side=tk.LEFT, padx=5)
+
+    max_frame = tk.Frame(sel_win)
+    max_frame.pack(fill=tk.X, padx=5, pady=2)
+    tk.Label(max_frame, text="Max parallel ezCon runs:", width=25, anchor="w").pack(side=tk.LEFT)
+    max_var = tk.IntVar(value=plot_max_invocations)
+    tk.Spinbox(max_frame, from_=1, to=16, textvariable=max_var, width=5).pack(side=tk.LEFT, padx=5)
+
+    plan_var = tk.StringVar()
+    tk.Label(sel_win, textvariable=plan_var, anchor="w", justify=tk.LEFT).pack(fill=tk.X, padx=5, pady=5)
+
+    def current_selection():
+        selected = [n for n, var in check_vars.items() if var.get()]
+        return sorted(set(selected + parse_plot_numbers(extra_var.get())))
+
+    def current_max():
+        try:
+            return max(1, int(max_var.get()))
+        except (tk.TclError, ValueError):
+            return 1
+
+    def update_plan(*args):
+        selection = current_selection()
+        ranges = plan_plot_ranges(selection, plots, current_max())
+        if ranges:
+            extras = unwanted_plots_in_ranges(ranges, selection, plots)
+            plan_var.set("-ezConPlotRangeL: " + ", ".join(f"{a} {b}" for a, b in ranges)
+                         + f"\n{len(ranges)} ezCon run(s), {sum(extras)} unselected plot(s) rendered as well"
+                         + " (" + ", ".join(f"{a}-{b}: {n}" for (a, b), n in zip(ranges, extras)) + ")")
+        else:
+            plan_var.set("No plots selected.")
+    for var in list(check_vars.values()) + [extra_var, max_var]:
+        var.trace_add("write", update_plan)
+    update_plan()
+
+    btn_frame = tk.Frame(sel_win)
+    btn_frame.pack(fill="x", pady=5)
+    def on_ok():
+        global plot_selection, plot_selection_active, plot_max_invocations
+        plot_selection = current_selection()
+        plot_selection_active = active_var.get()
+        plot_max_invocations = current_max()
+        log_debug("Plot selection updated: " + " ".join(str(n) for n in plot_selection))
+        sel_win.destroy()
+        update_cmd_preview()
+    tk.Button(btn_frame, text="OK", command=on_ok, width=10).pack(side=tk.LEFT, padx=5)
+    tk.Button(btn_frame, text="Cancel", command=sel_win.destroy, width=10).pack(side=tk.RIGHT, padx=5)
+
+# ---------------- Output Compression and Archival ----------------
+# Old run folders are packed into EZCONPNG_FILES/ARCHIVE/<folder>.zip. The .png files are
+# already deflate compressed, so they are stored as is; the zip index then lets one plot be
+# read without unpacking the rest. A small preview of every plot stays in <folder>_previews.
+ARCHIVE_DIR_NAME = "ARCHIVE"
+PREVIEW_SIZE = (160, 160)
+archive_after_days = 30  # Run folders untouched for this many days are archived
+optimize_workers = max(1, (os.cpu_count() or 2) - 1)
+active_output_folders = {}  # Output folder -> number of runs with pending or running jobs (Tk thread only)
+archive_lock = threading.Lock()  # Only one archive pass runs at a time
+
+def optimize_png(fpath):
+    """Losslessly recompress one .png file. Return the number of bytes saved."""
+    tmp_path = fpath + ".tmp"
+    with Image.open(fpath) as img:
+        img.save(tmp_path, format="PNG", optimize=True)
+    old_size = os.path.getsize(fpath)
+    new_size = os.path.getsize(tmp_path)
+    if new_size < old_size:
+        os.replace(tmp_path, fpath)
+        return old_size - new_size
+    os.remove(tmp_path)
+    return 0
+
+def optimize_pngs(paths):
+    """
+    Recompress .png files in a worker pool and return the total bytes saved.
+    Threads are used because Pillow releases the GIL while encoding.
+    """
+    saved = 0
+    with ThreadPoolExecutor(max_workers=optimize_workers) as pool:
+        futures = {pool.submit(optimize_png, path): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                saved += future.result()
+            except Exception as e:
+                call_in_ui(log_debug, "Error optimizing " + futures[future] + ": " + str(e))
+    return saved
+
+def archive_root_dir():
+    return os.path.join(WORKING_DIR, "EZCONPNG_FILES", ARCHIVE_DIR_NAME)
+
+def replace_archive_members(zip_path, names):
+    """Rewrite a zip archive without the members in names, so they can be added again."""
+    with zipfile.ZipFile(zip_path) as zin:
+        keep = [info for info in zin.infolist() if info.filename not in names]
+        if len(keep) == len(zin.infolist()):
+            return
+        tmp_path = zip_path + ".tmp"
+        with zipfile.ZipFile(tmp_path, "w") as zout:
+            for info in keep:
+                zout.writestr(info, zin.read(info))
+    os.replace(tmp_path, zip_path)
+
+def folder_files(folder):
+    """Return the names of all files below folder, relative to it with "/" separators."""
+    files = []
+    for dirpath, dirs, names in os.walk(folder):
+        rel = os.path.relpath(dirpath, folder)
+        files.extend(f if rel == "." else os.path.join(rel, f).replace(os.sep, "/") for f in names)
+    return sorted(files)
+
+def remove_empty_dirs(top):
+    """Remove top and the folders below it, as far as they are empty."""
+    for dirpath, dirs, names in os.walk(top, topdown=False):
+        if not os.listdir(dirpath):
+            os.rmdir(dirpath)
+
+def archive_run_folder(folder):
+    """
+    Move all files of a run folder, including the per data file subfolders of batch
+    runs, into its zip archive and write the previews.
+    The .png files are recompressed first; files already in the archive are replaced.
+    Return the list of archived file names.
+    """
+    name = os.path.basename(os.path.normpath(folder))
+    archive_dir = archive_root_dir()
+    preview_dir = os.path.join(archive_dir, name + "_previews")
+    extracted_dir = os.path.join(archive_dir, name + "_extracted")
+    os.makedirs(preview_dir, exist_ok=True)
+    zip_path = os.path.join(archive_dir, name + ".zip")
+    files = folder_files(folder)
+    # .png data is already deflated, so only a lossless re-encode makes it smaller.
+    optimize_pngs([os.path.join(folder, f) for f in files if f.lower().endswith(".png")])
+    if os.path.exists(zip_path):
+        replace_archive_members(zip_path, set(files))
+    archived = []
+    with zipfile.ZipFile(zip_path, "a", compression=zipfile.ZIP_STORED) as zf:
+        for f in files:
+            fpath = os.path.join(folder, f)
+            compression = zipfile.ZIP_STORED if f.lower().endswith(".png") else zipfile.ZIP_DEFLATED
+            zf.write(fpath, f, compress_type=compression)
+            archived.append(f)
+            # An earlier extracted copy would hide the new archive member.
+            if os.path.exists(os.path.join(extracted_dir, f)):
+                os.remove(os.path.join(extracted_dir, f))
+            if f.lower().endswith(".png"):
+                try:
+                    preview_path = os.path.join(preview_dir, f)
+                    os.makedirs(os.path.dirname(preview_path), exist_ok=True)
+                    with Image.open(fpath) as img:
+                        img.thumbnail(PREVIEW_SIZE)
+                        img.save(preview_path, format="PNG", optimize=True)
+                except Exception as e:
+                    call_in_ui(log_debug, "Error writing preview for " + f + ": " + str(e))
+    for f in archived:
+        os.remove(os.path.join(folder, f))
+    remove_empty_dirs(folder)
+    if os.path.isdir(extracted_dir):
+        remove_empty_dirs(extracted_dir)
+    return archived
+
+def busy_output_folders():
+    """Return the output folders that must not be archived (Tk thread only)."""
+    busy = set(active_output_folders)
+    if last_output_folder:
+        busy.add(last_output_folder)
+    return {os.path.normpath(path) for path in busy}
+
+def archive_old_runs(days, busy):
+    """
+    Archive every run folder under EZCONPNG_FILES whose files are all older than days.
+    Folders in busy, taken on the Tk thread with busy_output_folders, are skipped.
+    Passes from several threads are serialized by archive_lock.
+    """
+    with archive_lock:
+        output_root = os.path.join(WORKING_DIR, "EZCONPNG_FILES")
+        if not os.path.isdir(output_root):
+            return []
+        cutoff = time.time() - days * 86400
+        archived_folders = []
+        for entry in os.scandir(output_root):
+            if not entry.is_dir() or entry.name == ARCHIVE_DIR_NAME or entry.name.startswith("."):
+                continue
+            folder = os.path.normpath(entry.path)
+            if any(path == folder or path.startswith(folder + os.sep) for path in busy):
+                continue
+            mtimes = [os.path.getmtime(os.path.join(folder, f)) for f in folder_files(folder)]
+            if mtimes and max(mtimes) < cutoff:
+                try:
+                    files = archive_run_folder(entry.path)
+                    archived_folders.append(entry.name)
+                    call_in_ui(log_debug, f"Archived {len(files)} files from {entry.name}")
+                except Exception as e:
+                    call_in_ui(log_debug, "Error archiving " + entry.path + ": " + str(e))
+        return archived_folders
+
+def extract_archived_plot(archive_name, fname):
+    """Extract one file from a run archive and return its path on disk."""
+    archive_dir = archive_root_dir()
+    dest_dir = os.path.join(archive_dir, archive_name + "_extracted")
+    dest_path = os.path.join(dest_dir, fname)
+    if not os.path.exists(dest_path):
+        with zipfile.ZipFile(os.path.join(archive_dir, archive_name + ".zip")) as zf:
+            zf.extract(fname, dest_dir)
+    return dest_path
+
+def post_run_pipeline(output_folder, moved_files, optimize, archive):
+    """
+    Optional post-run stage: recompress the new plots, then archive old run folders.
+    Runs in a worker thread, so the option values are read on the Tk thread and passed in.
+    """
+    if optimize and output_folder and moved_files:
+        paths = [os.path.join(output_folder, f) for f in moved_files if f.lower().endswith(".png")]
+        saved = optimize_pngs(paths)
+        call_in_ui(log_debug, f"Optimized {len(paths)} .png files, saved {saved // 1024} KB")
+    if archive:
+        call_in_ui(start_auto_archive)
+
+def start_auto_archive():
+    """Queue an archive pass after a run; the busy folders are taken here on the Tk thread."""
+    post_run_executor.submit(archive_old_runs, archive_after_days, busy_output_folders())
+
+def menu_archive_old_runs():
+    """Ask for an age in days and archive the older run folders in the background."""
+    global archive_after_days
+    days = simpledialog.askinteger("Archive Old Runs", "Archive run folders older than (days):",
+                                   initialvalue=archive_after_days, minvalue=0, parent=root)
+    if days is None:
+        return
+    archive_after_days = days
+    busy = busy_output_folders()
+    def worker():
+        folders = archive_old_runs(days, busy)
+        call_in_ui(log_debug, "Archived run folders: " + (", ".join(folders) or "none"))
+    threading.Thread(target=worker, daemon=True).start()
+
+def open_archive_browser():
+    """Open a window showing the previews of an archived run; click a preview to open the full plot."""
+    archive_dir = archive_root_dir()
+    names = sorted(f[:-4] for f in os.listdir(archive_dir) if f.endswith(".zip")) if os.path.isdir(archive_dir) else []
+    if not names:
+        messagebox.showinfo("Archive", "No archived runs found.")
+        return
+    arch_win = tk.Toplevel(root)
+    arch_win.title("Archived Runs")
+    arch_win.geometry("900x700")
+
+    top = tk.Frame(arch_win)
+    top.pack(fill=tk.X, padx=5, pady=5)
+    tk.Label(top, text="Archived run:").pack(side=tk.LEFT)
+    name_var = tk.StringVar(value=names[-1])
+    ttk.Combobox(top, textvariable=name_var, values=names, state="readonly", width=30).pack(side=tk.LEFT, padx=5)
+    container = tk.Frame(arch_win)
+    container.pack(fill=tk.BOTH, expand=True)
+    grid_frame = create_scrollable_frame(container)
+    preview_images = []
+
+    def open_plot(archive_name, fname):
+        try:
+            webbrowser.open("file://" + os.path.abspath(extract_archived_plot(archive_name, fname)))
+        except Exception as e:
+            messagebox.showerror("Archive Error", str(e))
+
+    def show_previews(*args):
+        for widget in grid_frame.winfo_children():
+            widget.destroy()
+        preview_images.clear()
+        archive_name = name_var.get()
+        preview_dir = os.path.join(archive_dir, archive_name + "_previews")
+        with zipfile.ZipFile(os.path.join(archive_dir, archive_name + ".zip")) as zf:
+            members = sorted(n for n in zf.namelist() if n.lower().endswith(".png"))
+        for i, fname in enumerate(members):
+            frame = tk.Frame(grid_frame, padx=5, pady=5)
+            frame.grid(row=i // 5, column=i % 5)
+            preview_path = os.path.join(preview_dir, fname)
+            if os.path.exists(preview_path):
+                photo = ImageTk.PhotoImage(Image.open(preview_path))
+                preview_images.append(photo)
+                tk.Button(frame, image=photo, command=lambda f=fname: open_plot(archive_name, f)).pack()
+            else:
+                tk.Button(frame, text="(No preview)", command=lambda f=fname: open_plot(archive_name, f)).pack()
+            tk.Label(frame, text=fname, wraplength=150).pack()
+    name_var.trace_add("write", show_previews)
+    show_previews()
+
+# ---------------- Resource-Aware Scheduler ----------------
+# ezCon jobs wait in pending_jobs and are admitted while there is free memory for the job's
+# estimated need and the load average is below the limit. The estimate is
+# JOB_BASE_MB + mb_per_input_mb * input size, where mb_per_input_mb is learned from the
+# peak memory of earlier jobs: VmHWM from /proc on Linux, PeakWorkingSetSize on Windows.
+JOB_STATS_FILE_NAME = "ezcongui_jobstats.json"
+WORK_DIR_NAME = ".work"
+JOB_BASE_MB = 150.0
+DEFAULT_MB_PER_INPUT_MB = 40.0
+SCHEDULER_MIN_DELAY_MS = 500
+PEAK_SAMPLE_SECONDS = 0.2  # How often the supervisor reads a running job's peak memory
+SCHEDULER_MAX_DELAY_MS = 16000
+max_parallel_jobs = max(1, (os.cpu_count() or 2) - 1)
+memory_reserve_mb = 512  # Free memory always left to the rest of the system
+load_limit = float(os.cpu_count() or 1)
+job_stats = {"mb_per_input_mb": DEFAULT_MB_PER_INPUT_MB, "samples": 0}
+pending_jobs = deque()
+running_jobs = []
+scheduler_delay_ms = SCHEDULER_MIN_DELAY_MS
+scheduler_after_id = None
+
+def load_job_stats():
+    """Load the learned memory statistics from WORKING_DIR."""
+    global job_stats
+    try:
+        with open(os.path.join(WORKING_DIR, JOB_STATS_FILE_NAME), "r") as f:
+            job_stats = json.load(f)
+    except Exception:
+        job_stats = {"mb_per_input_mb": DEFAULT_MB_PER_INPUT_MB, "samples": 0}
+
+def save_job_stats():
+    try:
+        with open(os.path.join(WORKING_DIR, JOB_STATS_FILE_NAME), "w") as f:
+            json.dump(job_stats, f)
+    except Exception as e:
+        log_debug("Error saving job statistics: " + str(e))
+
+def available_memory_mb():
+    """Return the available physical memory in MB, or None if it cannot be determined."""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/meminfo", "r") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) / 1024
+        elif sys.platform == "win32":
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return status.ullAvailPhys / (1024 * 1024)
+    except Exception:
+        pass
+    return None
+
+cpu_times_sample = None  # Last (idle, total) CPU times, for the Windows load estimate
+
+def load_average():
+    """
+    Return the 1 minute load average. Windows has none, so there the busy CPU fraction since
+    the previous call times the number of CPUs is returned. None if it cannot be determined.
+    """
+    global cpu_times_sample
+    try:
+        if sys.platform == "win32":
+            idle, kernel, user = (ctypes.c_ulonglong(), ctypes.c_ulonglong(), ctypes.c_ulonglong())
+            if not ctypes.windll.kernel32.GetSystemTimes(ctypes.byref(idle), ctypes.byref(kernel), ctypes.byref(user)):
+                return None
+            # Kernel time includes the idle time.
+            sample = (idle.value, kernel.value + user.value)
+            previous, cpu_times_sample = cpu_times_sample, sample
+            if previous is None or sample[1] <= previous[1]:
+                return None
+            busy = 1 - (sample[0] - previous[0]) / (sample[1] - previous[1])
+            return max(0.0, busy) * (os.cpu_count() or 1)
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+def open_process_handle(pid):
+    """
+    On Windows, open and return a handle to query a process's memory counters, also after it
+    exited. Return None elsewhere or on failure.
+    """
+    if sys.platform != "win32":
+        return None
+    try:
+        kernel32 = ctypes.windll.kernel32
+        kernel32.OpenProcess.restype = ctypes.c_void_p
+        # PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ
+        return kernel32.OpenProcess(0x1000 | 0x0010, False, pid) or None
+    except Exception:
+        return None
+
+def close_process_handle(handle):
+    if handle:
+        ctypes.windll.kernel32.CloseHandle(ctypes.c_void_p(handle))
+
+def process_peak_memory_mb(pid, handle=None):
+    """
+    Return the peak resident memory of a process in MB, or None if it cannot be determined:
+    VmHWM on Linux, PeakWorkingSetSize of the handle from open_process_handle on Windows.
+    """
+    try:
+        if handle:
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+            if ctypes.windll.kernel32.K32GetProcessMemoryInfo(ctypes.c_void_p(handle), ctypes.byref(counters),
+                                                              counters.cb):
+                return counters.PeakWorkingSetSize / (1024 * 1024)
+        elif sys.platform.startswith("linux"):
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+def estimate_job_mb(input_size):
+    return JOB_BASE_MB + job_stats["mb_per_input_mb"] * input_size / (1024 * 1024)
+
+def learn_job_memory(job):
+    """Update the memory per input MB estimate from a finished job's peak memory."""
+    size_mb = job["input_size"] / (1024 * 1024)
+    if not job["peak_mb"] or size_mb < 0.1:
+        return
+    sample = max(0.0, job["peak_mb"] - JOB_BASE_MB) / size_mb
+    if job_stats["samples"] == 0:
+        job_stats["mb_per_input_mb"] = sample
+    else:
+        # Rise quickly, fall slowly, so one small job does not let a big batch into swap.
+        alpha = 0.5 if sample > job_stats["mb_per_input_mb"] else 0.1
+        job_stats["mb_per_input_mb"] += alpha * (sample - job_stats["mb_per_input_mb"])
+    job_stats["samples"] += 1
+
+def learn_job_duration(job):
+    """Update the seconds per input MB estimate, used for the progress shown by the status server."""
+    size_mb = max(0.1, job["input_size"] / (1024 * 1024))
+    sample = (job["end_time"] - job["start_time"]) / size_mb
+    previous = job_stats.get("sec_per_input_mb")
+    job_stats["sec_per_input_mb"] = sample if previous is None else previous + 0.3 * (sample - previous)
+
+def submit_job(cmd, input_size, on_exit):
+    """
+    Queue one ezCon process. It gets its own work directory when it is launched.
+    on_exit(job, returncode) is called on the Tk thread.
+    """
+    job = {"cmd": cmd, "cwd": None, "input_size": input_size, "on_exit": on_exit,
+           "estimate_mb": estimate_job_mb(input_size), "peak_mb": 0.0, "pid": None}
+    pending_jobs.append(job)
+    schedule_tick(0)
+
+def schedule_tick(delay_ms):
+    global scheduler_after_id
+    if scheduler_after_id is not None:
+        root.after_cancel(scheduler_after_id)
+    scheduler_after_id = root.after(delay_ms, scheduler_tick)
+
+def scheduler_tick():
+    """Sample running jobs and admit pending jobs while memory and load allow."""
+    global scheduler_after_id, scheduler_delay_ms
+    scheduler_after_id = None
+    available = available_memory_mb()
+    load = load_average()
+    admitted = 0
+    while pending_jobs and len(running_jobs) < max_parallel_jobs:
+        job = pending_jobs[0]
+        # One job is always allowed, otherwise the queue could stall forever.
+        if running_jobs:
+            if load is not None and load + admitted >= load_limit:
+                break
+            if available is not None:
+                # Memory the running jobs are still expected to grow into.
+                growth = sum(max(0.0, j["estimate_mb"] - j["peak_mb"]) for j in running_jobs)
+                if available - growth - job["estimate_mb"] < memory_reserve_mb:
+                    break
+        pending_jobs.popleft()
+        launch_job(job)
+        admitted += 1
+        if available is not None:
+            available -= job["estimate_mb"]
+    if pending_jobs and not admitted and running_jobs:
+        scheduler_delay_ms = min(scheduler_delay_ms * 2, SCHEDULER_MAX_DELAY_MS)
+    else:
+        scheduler_delay_ms = SCHEDULER_MIN_DELAY_MS
+    if pending_jobs or running_jobs:
+        schedule_tick(scheduler_delay_ms)
+
+def launch_job(job):
+    try:
+        job["cwd"] = new_work_dir()
+        job["work_files"] = write_work_defaults(job["cwd"])
+    except Exception as e:
+        log_debug("Error creating work directory: " + str(e))
+        job["on_exit"](job, -1)
+        return
+    log_debug("DEBUG: Running command:")
+    log_debug("  " + " ".join(job["cmd"]))
+    log_debug(f"DEBUG: Working directory: {job['cwd']} (estimated {job['estimate_mb']:.0f} MB)")
+    job["start_time"] = time.time()
+    running_jobs.append(job)
+    if len(running_jobs) == 1:
+        progress_bar.start(10)
+    asyncio.run_coroutine_threadsafe(supervise_job(job), supervisor_loop)
+
+def job_finished(job, returncode):
+    job["end_time"] = time.time()
+    running_jobs.remove(job)
+    if not running_jobs:
+        progress_bar.stop()
+    log_debug("Process finished with return code: " + str(returncode))
+    run_metrics["jobs_finished"] += 1
+    if returncode == 0:
+        run_metrics["job_seconds"] += job["end_time"] - job["start_time"]
+        learn_job_memory(job)
+        learn_job_duration(job)
+        save_job_stats()
+    else:
+        run_metrics["jobs_failed"] += 1
+    job["on_exit"](job, returncode)
+    schedule_tick(0)
+
+def menu_max_parallel_jobs():
+    global max_parallel_jobs
+    value = simpledialog.askinteger("Parallel ezCon Jobs", "Maximum number of parallel ezCon jobs:",
+                                    initialvalue=max_parallel_jobs, minvalue=1, maxvalue=64, parent=root)
+    if value:
+        max_parallel_jobs = value
+        log_debug(f"Maximum parallel ezCon jobs: {max_parallel_jobs}")
+
 # ---------------- Running ezCon ----------------
 def run_ezcon():
     """
@@ -527,7 +1352,6 @@ def run_ezcon():
     the date string is in ddmmyyyy format; otherwise, it is in yyyymmdd format.
     A progress meter is displayed during the run.
     """
-    global last_output_folder
     data_file = file_entry.get().strip()
     if not data_file:
         messagebox.showerror("Error", "Please select a .txt data file first!")
@@ -539,16 +1363,24 @@ def run_ezcon():
     if not os.path.exists(ezcon_path):
         messagebox.showerror("File Not Found", f"Cannot find ezCon.py at:\n{ezcon_path}")
         return
+    update_cmd_preview()
+    signature = options_signature()
 
-    abs_working = os.path.abspath(WORKING_DIR)
-    abs_file = os.path.abspath(data_file)
-    if abs_file.startswith(abs_working):
-        data_file_rel = os.path.relpath(data_file, WORKING_DIR)
-    else:
-        data_file_rel = data_file
-    data_file_rel = os.path.normpath(data_file_rel)
-    ezcon_path_norm = os.path.normpath(ezcon_path)
+    def on_done(returncode, output_folder, moved_files):
+        if returncode == 0:
+            record_done(file_fingerprint(data_file), signature)
+            save_fingerprint_index()
+        if returncode != 0:
+            messagebox.showerror("ezCon Error",
+                                 f"ezCon.py failed with return code {returncode}.\nCheck debug output for details.")
+        else:
+            messagebox.showinfo("ezCon Output",
+                                "ezCon.py completed successfully.\nCheck debug output for details.")
+            update_thumbnails()
+    start_run(data_file, on_done)
 
+def run_subfolder_name(data_file):
+    """Return the date named EZCONPNG_FILES subfolder for a data file."""
     # Determine subfolder name based on folder_style_var.
     # If folder_style_var is True, use ddmmyyyy format (ignoring any filename match).
     if folder_style_var.get():
@@ -572,9 +1404,22 @@ def run_ezcon():
             except Exception as e:
                 log_debug("Error determining subfolder name: " + str(e))
                 subfolder_name = "UnknownDate"
+    return subfolder_name
+
+def start_run(data_file, on_done=None, cmds=None, output_folder=None):
+    """
+    Start ezCon.py for one data file and return immediately.
+    When all ezCon processes are finished, the new .png files are moved into the output
+    folder, a run manifest is written and on_done(returncode, output_folder, moved_files) is called.
+    cmds and output_folder default to the current options and the date named subfolder.
+    """
+    global last_output_folder
+    # Each ezCon process runs in its own work directory, so paths are absolute here.
+    data_file_abs = os.path.normpath(os.path.abspath(data_file))
 
     # Create the full output folder under EZCONPNG_FILES.
-    output_folder = os.path.join(WORKING_DIR, "EZCONPNG_FILES", subfolder_name)
+    if output_folder is None:
+        output_folder = os.path.join(WORKING_DIR, "EZCONPNG_FILES", run_subfolder_name(data_file))
     try:
         if output_folder:
             os.makedirs(output_folder, exist_ok=True)
@@ -583,63 +1428,1503 @@ def run_ezcon():
     except Exception as e:
         log_debug("Error creating output folder: " + str(e))
         output_folder = None
+    if output_folder:
+        active_output_folders[output_folder] = active_output_folders.get(output_folder, 0) + 1
 
-    cmd = build_command_line(data_file_rel, ezcon_path_norm)
-    update_cmd_preview()
-    log_debug("DEBUG: Running command:")
-    log_debug("  " + " ".join(cmd))
-    log_debug("DEBUG: Working directory: " + WORKING_DIR)
-    run_start_time = time.time()
+    if cmds is None:
+        cmds = build_run_command_lines(data_file)
+    else:
+        cmds = [pin_defaults_files(cmd) for cmd in cmds]
+    try:
+        data_size = os.path.getsize(data_file)
+    except OSError:
+        data_size = 0
+    run = {"pending": len(cmds), "returncode": 0, "jobs": []}
+    optimize = optimize_png_var.get()
+    archive = auto_archive_var.get()
+
+    def on_exit(job, returncode):
+        run["pending"] -= 1
+        run["jobs"].append(job)
+        if returncode != 0:
+            run["returncode"] = returncode
+        if run["pending"] == 0:
+            post_run_executor.submit(finish_run)
+
+    def finish_run():
+        moved_files = []
+        for job in [job for job in run["jobs"] if job["cwd"]]:
+            work_dir = job["cwd"]
+            # A work directory is only removed once all of its files were moved.
+            if run["returncode"] != 0:
+                call_in_ui(log_debug, "Kept work directory of the failed run: " + work_dir)
+                continue
+            try:
+                moved_files.extend(collect_job_outputs(work_dir, output_folder, job.get("work_files", [])))
+            except Exception as e:
+                call_in_ui(log_debug, "Error moving files from " + work_dir + ": " + str(e)
+                           + " (work directory kept)")
+                run["returncode"] = 1
+                continue
+            shutil.rmtree(work_dir, ignore_errors=True)
+        if run["returncode"] == 0:
+            if output_folder:
+                call_in_ui(log_debug, "Moved .png files: " + ", ".join(moved_files))
+            post_run_pipeline(output_folder, moved_files, optimize, archive)
+            if output_folder:
+                try:
+                    write_manifest(data_file_abs, output_folder, run["jobs"], moved_files)
+                except Exception as e:
+                    call_in_ui(log_debug, "Error writing manifest: " + str(e))
+        if output_folder:
+            call_in_ui(release_output_folder, output_folder)
+        if moved_files:
+            call_in_ui(learn_plots, moved_files)
+        if on_done:
+            call_in_ui(on_done, run["returncode"], output_folder, moved_files)
+
+    # With a plot selection, each planned plot range runs as its own ezCon job.
+    for cmd in cmds:
+        submit_job(cmd, data_size, on_exit)
+
+def release_output_folder(output_folder):
+    """Forget an output folder once a run writing into it has finished."""
+    count = active_output_folders.get(output_folder, 0) - 1
+    if count > 0:
+        active_output_folders[output_folder] = count
+    else:
+        active_output_folders.pop(output_folder, None)
+
+def pin_defaults_files(cmd):
+    """
+    Return cmd with its relative -ezDefaultsFile values made absolute against WORKING_DIR.
+    ezCon resolves relative paths against its current directory, which is the job's work
+    directory; the ezDefaults files themselves are handled by write_work_defaults.
+    """
+    pinned = list(cmd)
+    for i in range(3, len(cmd) - 1):
+        if cmd[i] == "-ezDefaultsFile":
+            pinned[i + 1] = os.path.normpath(os.path.join(WORKING_DIR, cmd[i + 1]))
+    return pinned
 
-    # Start the progress bar (indeterminate mode)
-    progress_bar.start(10)
+def write_work_defaults(work_dir):
+    """
+    Give a job's work directory the ezDefaults.txt ezCon reads from its current directory:
+    a copy of WORKING_DIR's ezDefaults.txt in which relative -ezDefaultsFile paths point to
+    the same files as seen from WORKING_DIR. Nested files with relative references of their
+    own are copied and rewritten the same way, so ezCon reads the values in the same order
+    as when it ran in WORKING_DIR. Return the names of the files written.
+    """
+    copies = {}
 
+    def rewrite(src, dest):
+        copies[src] = dest
+        lines = []
+        with open(src, "r") as f:
+            for line in f:
+                parts = line.split("#", 1)[0].split()
+                if len(parts) > 1 and parts[0] == "-ezDefaultsFile" and not os.path.isabs(" ".join(parts[1:])):
+                    nested = os.path.normpath(os.path.join(WORKING_DIR, " ".join(parts[1:])))
+                    if nested in copies:
+                        nested = copies[nested]
+                    elif os.path.exists(nested) and has_relative_defaults_file(nested):
+                        nested = rewrite(nested, os.path.join(work_dir, f"ezDefaults_{len(copies)}.txt"))
+                    line = f"-ezDefaultsFile {nested}\n"
+                lines.append(line)
+        with open(dest, "w") as f:
+            f.writelines(lines)
+        return dest
+
+    defaults_file = os.path.join(WORKING_DIR, "ezDefaults.txt")
+    if os.path.exists(defaults_file):
+        rewrite(os.path.normpath(defaults_file), os.path.join(work_dir, "ezDefaults.txt"))
+    return [os.path.basename(dest) for dest in copies.values()]
+
+def has_relative_defaults_file(path):
+    nested = read_defaults(path).get("-ezDefaultsFile")
+    return bool(nested) and not os.path.isabs(nested)
+
+def build_run_command_lines(data_file, ranges=None):
+    """Return the command lines start_run runs for data_file: absolute paths, pinned ezDefaults files."""
+    ezcon_path_norm = os.path.normpath(os.path.abspath(os.path.join(WORKING_DIR, "ezCon.py")))
+    data_file_abs = os.path.normpath(os.path.abspath(data_file))
+    return [pin_defaults_files(cmd) for cmd in build_command_lines(data_file_abs, ezcon_path_norm, ranges)]
+
+def new_work_dir():
+    """Create and return an empty work directory for one ezCon process."""
+    work_root = os.path.join(WORKING_DIR, "EZCONPNG_FILES", WORK_DIR_NAME)
+    os.makedirs(work_root, exist_ok=True)
+    return tempfile.mkdtemp(prefix="job", dir=work_root)
+
+def collect_job_outputs(work_dir, output_folder, skip=()):
+    """
+    Move the files ezCon wrote into work_dir: .png files go to output_folder,
+    everything else to WORKING_DIR as if ezCon had run there. The files named in skip,
+    written by write_work_defaults, stay. Return the moved .png names.
+    """
+    moved_files = []
+    for f in sorted(os.listdir(work_dir)):
+        fpath = os.path.join(work_dir, f)
+        if f in skip or not os.path.isfile(fpath):
+            continue
+        if f.lower().endswith(".png") and output_folder:
+            shutil.move(fpath, os.path.join(output_folder, f))
+            moved_files.append(f)
+        else:
+            shutil.move(fpath, os.path.join(WORKING_DIR, f))
+    return moved_files
+
+# ---------------- Run Manifests ----------------
+# Every run writes <data file name>.manifest.json into its output folder with everything
+# needed to repeat it: the exact command lines, the ezDefaults files ezCon read, the ezCon
+# revision, the data file hash, timings and the output files.
+MANIFEST_SUFFIX = ".manifest.json"
+RERUN_FOLDER_SUFFIX = "_rerun_"
+RECORDED_DEFAULTS_SUFFIX = ".ezDefaults.txt"
+manifest_lock = threading.Lock()  # Serializes manifest writes from the post-run workers
+REVISION_RE = re.compile(r'programRevision\s*=\s*(\S+)')
+
+def defaults_chain(cmds, cwd=None):
+    """
+    Return the ezDefaults files ezCon reads for these command lines when it runs in cwd
+    (default WORKING_DIR), in reading order: the ezDefaults.txt next to ezCon.py, the one
+    in cwd, then every -ezDefaultsFile on the command line. A -ezDefaultsFile named inside
+    a file is read right after it. Like ezCon, relative paths are resolved against cwd,
+    and files that do not exist are left out.
+    """
+    cwd = cwd or WORKING_DIR
+    ezcon_dir = os.path.dirname(cmds[0][1])
+    paths = [os.path.join(ezcon_dir, "ezDefaults.txt"), os.path.join(cwd, "ezDefaults.txt")]
+    for cmd in cmds:
+        for i, token in enumerate(cmd[:-1]):
+            if token == "-ezDefaultsFile" and cmd[i + 1] not in paths:
+                paths.append(cmd[i + 1])
+    chain = []
+    i = 0
+    while i < len(paths):
+        path = os.path.normpath(os.path.join(cwd, paths[i]))
+        i += 1
+        if not os.path.exists(path) or any(entry["path"] == path for entry in chain):
+            continue
+        entry = {"path": path, "sha256": file_hash(path), "values": read_defaults(path)}
+        if entry["values"].get("-ezDefaultsFile"):
+            paths.insert(i, entry["values"]["-ezDefaultsFile"])
+        chain.append(entry)
+    return chain
+
+def changed_defaults(chain):
+    """Return the paths of the ezDefaults files in a recorded chain that changed since."""
+    changed = []
+    for entry in chain:
+        path = entry["path"]
+        current = file_hash(path) if os.path.exists(path) else None
+        if current != entry["sha256"]:
+            changed.append(path)
+    return changed
+
+def write_manifest(data_file, output_folder, jobs, outputs):
+    """Write the manifest of a finished run into its output folder and return its path."""
+    jobs = sorted(jobs, key=lambda job: job["cmd"])
+    cmds = [job["cmd"] for job in jobs]
+    # The work directory's ezDefaults.txt mirrors WORKING_DIR's (see write_work_defaults).
+    chain = defaults_chain(cmds)
+    effective = {}
+    for entry in chain:
+        effective.update(entry["values"])
+    revisions = sorted(set(job["revision"] for job in jobs if job.get("revision")))
+    manifest = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "data_file": data_file,
+        "data_file_sha256": file_fingerprint(data_file),
+        "ezcon_revision": revisions[0] if len(revisions) == 1 else (revisions or None),
+        "argv": cmds,
+        "defaults_chain": chain,
+        "effective_defaults": effective,
+        "timings": [{"start": job.get("start_time"), "end": job.get("end_time"),
+                     "seconds": round(job["end_time"] - job["start_time"], 2)
+                     if job.get("start_time") and job.get("end_time") else None,
+                     "peak_mb": round(job["peak_mb"], 1)} for job in jobs],
+        "outputs": sorted(outputs),
+    }
+    manifest_path = os.path.join(output_folder, os.path.splitext(os.path.basename(data_file))[0] + MANIFEST_SUFFIX)
+    with manifest_lock:
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=1)
+        mark_overwritten_outputs(output_folder, manifest_path, outputs)
+    return manifest_path
+
+def mark_overwritten_outputs(output_folder, manifest_path, outputs):
+    """
+    ezCon's plot names are fixed, so a run into a folder that already holds another run
+    overwrites its plots. Move those names from the other manifests' "outputs" to
+    "overwritten_outputs", so no manifest lists plots it did not produce.
+    """
+    outputs = set(outputs)
+    for name in os.listdir(output_folder):
+        other_path = os.path.join(output_folder, name)
+        if not name.endswith(MANIFEST_SUFFIX) or name == os.path.basename(manifest_path):
+            continue
+        try:
+            with open(other_path, "r") as f:
+                other = json.load(f)
+            lost = sorted(outputs & set(other.get("outputs", [])))
+            if not lost:
+                continue
+            other["outputs"] = [name for name in other["outputs"] if name not in outputs]
+            overwritten = other.setdefault("overwritten_outputs", {})
+            for name in lost:
+                overwritten[name] = os.path.basename(manifest_path)
+            with open(other_path, "w") as f:
+                json.dump(other, f, indent=1)
+        except Exception as e:
+            call_in_ui(log_debug, "Error updating manifest " + other_path + ": " + str(e))
+
+def find_manifests(directory):
+    """Return the paths of all run manifests below directory."""
+    found = []
+    for folder, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        found.extend(os.path.join(folder, f) for f in files if f.endswith(MANIFEST_SUFFIX))
+    return sorted(found)
+
+def write_recorded_defaults(path, effective):
+    """Write the recorded effective ezDefaults values of a run as an ezDefaults file."""
+    with open(path, "w") as f:
+        f.write("# ezDefaults values recorded in the run manifest\n")
+        for key, value in effective.items():
+            if key != "-ezDefaultsFile":
+                f.write(f"{key} {value}\n")
+
+def with_recorded_defaults(cmd, defaults_path):
+    """
+    Return cmd reading the recorded ezDefaults values from defaults_path instead of its
+    -ezDefaultsFile files. The file comes first on the command line, so it overrides the
+    current ezDefaults.txt while the recorded options still override it.
+    """
+    rebuilt = cmd[:3] + ["-ezDefaultsFile", defaults_path]
+    i = 3
+    while i < len(cmd):
+        if cmd[i] == "-ezDefaultsFile" and i + 1 < len(cmd):
+            i += 2
+            continue
+        rebuilt.append(cmd[i])
+        i += 1
+    return rebuilt
+
+def plan_manifest_runs(directory, stamp):
+    """
+    Read the run manifests below directory and return (runs, skipped, warnings).
+    runs holds (data_file, cmds, output_folder) for every run that can be repeated;
+    skipped holds (manifest_path, reason) for the others and warnings (manifest_path, text)
+    for runs that are repeated with recorded values. Re-runs write into a new folder
+    <run folder>_rerun_<stamp>, so the original plots stay for comparison.
+    """
+    runs, skipped, warnings = [], [], []
+    for manifest_path in find_manifests(directory):
+        if RERUN_FOLDER_SUFFIX in os.path.basename(os.path.dirname(manifest_path)):
+            skipped.append((manifest_path, "output of an earlier re-run"))
+            continue
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            data_file = manifest["data_file"]
+            if not os.path.exists(data_file):
+                skipped.append((manifest_path, "data file missing"))
+                continue
+            if file_fingerprint(data_file) != manifest["data_file_sha256"]:
+                skipped.append((manifest_path, "data file changed since the run"))
+                continue
+            # The interpreter may have moved; everything else is repeated exactly.
+            cmds = [[sys.executable] + cmd[1:] for cmd in manifest["argv"]]
+            output_folder = os.path.dirname(manifest_path) + RERUN_FOLDER_SUFFIX + stamp
+            changed = changed_defaults(manifest.get("defaults_chain", []))
+            if changed:
+                # Rebuild the recorded values instead of the edited ezDefaults files.
+                recorded = manifest.get("effective_defaults", {})
+                current = {}
+                for entry in defaults_chain(cmds):
+                    current.update(entry["values"])
+                os.makedirs(output_folder, exist_ok=True)
+                defaults_path = os.path.join(output_folder, os.path.basename(manifest_path)[:-len(MANIFEST_SUFFIX)]
+                                             + RECORDED_DEFAULTS_SUFFIX)
+                write_recorded_defaults(defaults_path, recorded)
+                cmds = [with_recorded_defaults(cmd, defaults_path) for cmd in cmds]
+                text = "ezDefaults changed since the run (" + ", ".join(changed) + "), the recorded values are used"
+                added = sorted(key for key in set(current) - set(recorded) if key != "-ezDefaultsFile")
+                if added:
+                    text += "; keys added since cannot be removed: " + " ".join(added)
+                warnings.append((manifest_path, text))
+            runs.append((data_file, cmds, output_folder))
+        except Exception as e:
+            skipped.append((manifest_path, "error reading manifest: " + str(e)))
+    return runs, skipped, warnings
+
+def rerun_from_manifests():
+    """Ask for a manifest file or folder and queue the exact ezCon jobs it recorded."""
+    if batch_remaining:
+        messagebox.showerror("Batch", "A batch is already running.")
+        return
+    directory = filedialog.askdirectory(title="Select Folder with Run Manifests",
+                                        initialdir=os.path.join(WORKING_DIR, "EZCONPNG_FILES"))
+    if not directory:
+        return
+    log_debug("Reading run manifests in " + directory + " ...")
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def worker():
+        runs, skipped, warnings = plan_manifest_runs(directory, stamp)
+        save_fingerprint_index()
+        call_in_ui(start_manifest_runs, runs, skipped, warnings)
+    threading.Thread(target=worker, daemon=True).start()
+
+def start_manifest_runs(runs, skipped, warnings):
+    """Log the skipped manifests and warnings and queue the runs to repeat."""
+    global batch_signature, batch_remaining
+    for manifest_path, reason in skipped:
+        log_debug("Skipping manifest " + manifest_path + ": " + reason)
+    for manifest_path, text in warnings:
+        log_debug("Warning for manifest " + manifest_path + ": " + text)
+    log_debug(f"Found {len(runs) + len(skipped)} manifests, re-running {len(runs)}.")
+    if skipped or warnings:
+        messagebox.showwarning("Re-run from Manifests",
+                               f"{len(skipped)} of {len(runs) + len(skipped)} runs are skipped, "
+                               f"{len(warnings)} are repeated with their recorded ezDefaults values "
+                               "because the ezDefaults files changed; see the debug log.")
+    if not runs:
+        return
+    if batch_remaining:
+        messagebox.showerror("Batch", "A batch is already running.")
+        return
+    # Runs from manifests keep their own options, so they are not recorded under the current signature.
+    batch_signature = None
+    batch_remaining = len(runs)
+    batch_results.update(ok=0, failed=0)
+    for data_file, cmds, output_folder in runs:
+        start_batch_file(data_file, cmds, output_folder)
+
+# ---------------- Data File Fingerprints ----------------
+# The index remembers a content hash for every data file seen (reused while size and mtime
+# are unchanged) and, per content hash, the option signatures it was processed with.
+INDEX_FILE_NAME = "ezcongui_index.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+NON_DATA_FILES = {"ezdefaults.txt", "ezconguiset.txt"}
+DATA_LINE_SEARCH_LINES = 200  # Lines read to find the first ezCol data line
+fingerprint_index = {"files": {}, "done": {}}
+fingerprint_lock = threading.Lock()
+
+def load_fingerprint_index():
+    """Load the fingerprint index from WORKING_DIR."""
+    global fingerprint_index
+    index_file = os.path.join(WORKING_DIR, INDEX_FILE_NAME)
     try:
-        process = subprocess.Popen(
-            cmd,
-            cwd=WORKING_DIR,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        with open(index_file, "r") as f:
+            index = json.load(f)
+        fingerprint_index = {"files": index.get("files", {}), "done": index.get("done", {})}
+    except Exception:
+        fingerprint_index = {"files": {}, "done": {}}
+
+def save_fingerprint_index():
+    """Write the fingerprint index to WORKING_DIR."""
+    index_file = os.path.join(WORKING_DIR, INDEX_FILE_NAME)
+    with fingerprint_lock:
+        data = json.dumps(fingerprint_index, separators=(",", ":"))
+    try:
+        with open(index_file + ".tmp", "w") as f:
+            f.write(data)
+        os.replace(index_file + ".tmp", index_file)
     except Exception as e:
-        log_debug("Exception while running subprocess: " + str(e))
-        messagebox.showerror("Execution Error", str(e))
-        progress_bar.stop()
+        call_in_ui(log_debug, "Error saving fingerprint index: " + str(e))
+
+def file_hash(path):
+    """Return the SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_fingerprint(path, stat=None):
+    """
+    Return the content hash of a data file.
+    The hash is only computed when the file's size or mtime differ from the index.
+    """
+    key = os.path.abspath(path)
+    stat = stat or os.stat(path)
+    with fingerprint_lock:
+        entry = fingerprint_index["files"].get(key)
+    if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+        return entry["hash"]
+    digest = file_hash(path)
+    with fingerprint_lock:
+        fingerprint_index["files"][key] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": digest}
+    return digest
+
+def options_signature():
+    """
+    Return a short signature of the current ezCon options, independent of the data file:
+    the contents of the ezDefaults files ezCon reads, the plot selection settings and the
+    active advanced options.
+    """
+    ezcon_path_norm = os.path.normpath(os.path.abspath(os.path.join(WORKING_DIR, "ezCon.py")))
+    options = {key: advanced_options.get(key, "").split() for key in advanced_options
+               if advanced_options_active.get(key, False) and advanced_options.get(key, "").strip()}
+    state = {
+        "defaults": [entry["sha256"] for entry in defaults_chain([build_command_line("", ezcon_path_norm)])],
+        "plot_selection": sorted(plot_selection),
+        "plot_selection_active": plot_selection_active,
+        "plot_max_invocations": plot_max_invocations,
+        "options": options,
+    }
+    text = json.dumps(state, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+def is_done(digest, signature):
+    with fingerprint_lock:
+        return signature in fingerprint_index["done"].get(digest, [])
+
+def record_done(digest, signature):
+    with fingerprint_lock:
+        done = fingerprint_index["done"].setdefault(digest, [])
+        if signature not in done:
+            done.append(signature)
+
+def timestamp_tokens(tokens):
+    """Return how many leading tokens of a line form an ezCol timestamp (1 or 2), or 0."""
+    if len(tokens) > 1 and TIMESTAMP_RE.match(tokens[0] + " " + tokens[1]):
+        return 2
+    if tokens and TIMESTAMP_RE.match(tokens[0]):
+        return 1
+    return 0
+
+def is_ezcol_file(path, max_lines=DATA_LINE_SEARCH_LINES):
+    """Return True if one of the first lines of path is an ezCol data line (timestamp and values)."""
+    try:
+        with open(path, "r", errors="replace") as f:
+            for _, line in zip(range(max_lines), f):
+                tokens = line.split()
+                stamp_len = timestamp_tokens(tokens)
+                if stamp_len and len(tokens) > stamp_len + 1:
+                    return True
+    except OSError:
+        pass
+    return False
+
+def scan_data_files(directory, exclude=()):
+    """
+    Return the paths and stat results of all .txt files below directory that could be
+    ezCol data files. Files named in exclude (e.g. the ezDefaults files) are left out.
+    """
+    exclude = {os.path.normcase(os.path.abspath(path)) for path in exclude}
+    found = []
+    stack = [directory]
+    while stack:
+        folder = stack.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name != "EZCONPNG_FILES" and not entry.name.startswith("."):
+                    stack.append(entry.path)
+            elif (entry.name.lower().endswith(".txt") and entry.name.lower() not in NON_DATA_FILES
+                  and os.path.normcase(os.path.abspath(entry.path)) not in exclude):
+                found.append((entry.path, entry.stat()))
+    return sorted(found)
+
+def plan_batch(directory, signature, exclude=()):
+    """
+    Fingerprint the ezCol data files below directory; other .txt files are not queued.
+    Return (to_run, already_done, duplicates, not_data), each a list of file paths.
+    """
+    found = scan_data_files(directory, exclude)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        is_data = list(pool.map(lambda item: is_ezcol_file(item[0]), found))
+        not_data = [path for (path, _), ok in zip(found, is_data) if not ok]
+        found = [item for item, ok in zip(found, is_data) if ok]
+        digests = list(pool.map(lambda item: file_fingerprint(*item), found))
+    to_run, already_done, duplicates = [], [], []
+    seen = set()
+    for (path, _), digest in zip(found, digests):
+        if is_done(digest, signature):
+            already_done.append(path)
+        elif digest in seen:
+            duplicates.append(path)
+        else:
+            seen.add(digest)
+            to_run.append(path)
+    save_fingerprint_index()
+    return to_run, already_done, duplicates, not_data
+
+# ---------------- Batch Queue ----------------
+batch_remaining = 0    # Data files of the current batch not finished yet
+batch_results = {"ok": 0, "failed": 0}
+batch_signature = None
+
+def run_batch_directory():
+    """Ask for a directory and queue its data files that were not yet processed with these options."""
+    global batch_signature
+    if batch_remaining:
+        messagebox.showerror("Batch", "A batch is already running.")
+        return
+    if not os.path.exists(os.path.join(WORKING_DIR, "ezCon.py")):
+        messagebox.showerror("File Not Found", f"Cannot find ezCon.py in:\n{WORKING_DIR}")
         return
+    directory = filedialog.askdirectory(title="Select Data Directory", initialdir=WORKING_DIR)
+    if not directory:
+        return
+    batch_signature = options_signature()
+    ezcon_path_norm = os.path.normpath(os.path.abspath(os.path.join(WORKING_DIR, "ezCon.py")))
+    defaults_files = [entry["path"] for entry in defaults_chain([build_command_line("", ezcon_path_norm)])]
+    log_debug("Scanning " + directory + " ...")
+
+    def worker():
+        start = time.time()
+        to_run, already_done, duplicates, not_data = plan_batch(directory, batch_signature, defaults_files)
+        call_in_ui(start_batch, to_run, already_done, duplicates, not_data, time.time() - start)
+    threading.Thread(target=worker, daemon=True).start()
+
+def start_batch(to_run, already_done, duplicates, not_data, scan_seconds):
+    """Log the batch plan and queue the data files to run."""
+    global batch_remaining
+    log_debug(f"Scanned {len(to_run) + len(already_done) + len(duplicates)} data files in {scan_seconds:.1f} s")
+    for path in not_data:
+        log_debug("Skipping (no ezCol data lines): " + path)
+    for path in already_done:
+        log_debug("Skipping (already processed with these options): " + path)
+    for path in duplicates:
+        log_debug("Skipping (duplicate content): " + path)
+    if not to_run:
+        messagebox.showinfo("Batch", "Nothing to do, all data files are already processed.")
+        return
+    batch_remaining = len(to_run)
+    batch_results.update(ok=0, failed=0)
+    # The plot ranges are planned once for the whole batch.
+    ranges = current_plot_ranges()
+    # ezCon plot names are fixed and a day usually has several data files, so every file
+    # gets its own output folder <date>/<data file name>.
+    used_folders = set()
+    # All files are queued at once; the scheduler decides how many run in parallel.
+    for data_file in to_run:
+        cmds = build_run_command_lines(data_file, ranges)
+        output_folder = batch_output_folder(data_file)
+        suffix = 1
+        while os.path.normcase(output_folder) in used_folders:
+            suffix += 1
+            output_folder = batch_output_folder(data_file) + f"_{suffix}"
+        used_folders.add(os.path.normcase(output_folder))
+        start_batch_file(data_file, cmds, output_folder)
+
+def batch_output_folder(data_file):
+    """Return the output folder of one data file in a batch: EZCONPNG_FILES/<date>/<data file name>."""
+    stem = os.path.splitext(os.path.basename(data_file))[0]
+    return os.path.join(WORKING_DIR, "EZCONPNG_FILES", run_subfolder_name(data_file), stem)
+
+def start_batch_file(data_file, cmds=None, output_folder=None):
+    def on_done(returncode, output_folder, moved_files):
+        if returncode == 0 and batch_signature:
+            record_done(file_fingerprint(data_file), batch_signature)
+        batch_file_done(data_file, returncode)
+    start_run(data_file, on_done, cmds, output_folder)
+
+def batch_file_done(data_file, returncode):
+    global batch_remaining
+    batch_remaining -= 1
+    if returncode == 0:
+        batch_results["ok"] += 1
+    else:
+        batch_results["failed"] += 1
+        log_debug(f"Batch: {data_file} failed with return code {returncode}")
+    if batch_remaining:
+        return
+    save_fingerprint_index()
+    log_debug(f"Batch finished: {batch_results['ok']} succeeded, {batch_results['failed']} failed.")
+    messagebox.showinfo("Batch", f"Batch finished.\n{batch_results['ok']} succeeded, {batch_results['failed']} failed.")
+    update_thumbnails()
+
+# ---------------- Run Comparison ----------------
+# Shows the same plot from several run folders with one shared zoom/pan view and a
+# difference image. Decoding, scaling and diffing run on a worker thread; the worker
+# only renders the visible part of each plot at screen size, from a reduced copy
+# of the image when zoomed out.
+COMPARE_CANVAS_SIZE = (360, 300)
+COMPARE_BACKGROUND = (128, 128, 128)
+COMPARE_CACHE_PATHS = 8  # Decoded images kept by the comparison worker
+DIFF_THRESHOLD = 8  # Pixel difference counted as "changed" in the statistics
+
+def list_run_folders():
+    """
+    Return the names of the run folders under EZCONPNG_FILES, relative to it.
+    The per data file subfolders of batch runs are listed as <date>/<data file>.
+    """
+    output_root = os.path.join(WORKING_DIR, "EZCONPNG_FILES")
+    folders = []
+    for dirpath, dirs, files in os.walk(output_root):
+        dirs[:] = [d for d in dirs if d != ARCHIVE_DIR_NAME and not d.startswith(".")]
+        if dirpath != output_root and any(f.lower().endswith(".png") for f in files):
+            folders.append(os.path.relpath(dirpath, output_root).replace(os.sep, "/"))
+    return sorted(folders)
+
+def common_plots(folders):
+    """Return the .png file names present in all the given run folders."""
+    output_root = os.path.join(WORKING_DIR, "EZCONPNG_FILES")
+    names = None
+    for folder in folders:
+        try:
+            pngs = set(f for f in os.listdir(os.path.join(output_root, folder)) if f.lower().endswith(".png"))
+        except OSError:
+            pngs = set()
+        names = pngs if names is None else names & pngs
+    return sorted(names or [])
 
-    stdout_thread = threading.Thread(target=read_stream, args=(process.stdout, "STDOUT: "))
-    stderr_thread = threading.Thread(target=read_stream, args=(process.stderr, "STDERR: "))
-    stdout_thread.start()
-    stderr_thread.start()
+def reduced_image(cache, path, factor):
+    """
+    Return the image at path reduced by an integer factor, decoding and reducing only once.
+    cache is an OrderedDict path -> {factor: image} holding the COMPARE_CACHE_PATHS most
+    recently used images.
+    """
+    images = cache.get(path)
+    if images is None:
+        images = cache[path] = {}
+        while len(cache) > COMPARE_CACHE_PATHS:
+            cache.popitem(last=False)
+    cache.move_to_end(path)
+    if factor not in images:
+        if factor == 1:
+            with Image.open(path) as img:
+                images[factor] = img.convert("RGB")
+        else:
+            images[factor] = reduced_image(cache, path, 1).reduce(factor)
+    return images[factor]
 
-    def wait_for_process():
-        process.wait()
-        stdout_thread.join()
-        stderr_thread.join()
-        progress_bar.stop()
-        log_debug("Process finished with return code: " + str(process.returncode))
-        if process.returncode != 0:
-            messagebox.showerror("ezCon Error",
-                                 f"ezCon.py failed with return code {process.returncode}.\nCheck debug output for details.")
+def render_view(cache, path, view, size):
+    """
+    Render the view (center x, center y as image fractions, zoom; zoom 1 fits the image)
+    of one image at the canvas size. Return the RGB array and the image size.
+    """
+    full = reduced_image(cache, path, 1)
+    w, h = full.size
+    cx, cy, zoom = view
+    scale = min(size[0] / w, size[1] / h) * zoom
+    box = (cx * w - size[0] / scale / 2, cy * h - size[1] / scale / 2,
+           cx * w + size[0] / scale / 2, cy * h + size[1] / scale / 2)
+    clipped = (max(0.0, box[0]), max(0.0, box[1]), min(float(w), box[2]), min(float(h), box[3]))
+    tile = Image.new("RGB", size, COMPARE_BACKGROUND)
+    dest_w = int(round((clipped[2] - clipped[0]) * scale))
+    dest_h = int(round((clipped[3] - clipped[1]) * scale))
+    if dest_w > 0 and dest_h > 0:
+        # Use a reduced copy (power of 2, so few are cached) when several source pixels
+        # fall on one screen pixel.
+        factor = 1
+        while factor * 2 <= 1 / scale:
+            factor *= 2
+        source = reduced_image(cache, path, factor)
+        part = source.resize((dest_w, dest_h), Image.BILINEAR,
+                             box=tuple(v / factor for v in clipped))
+        tile.paste(part, (int(round((clipped[0] - box[0]) * scale)), int(round((clipped[1] - box[1]) * scale))))
+    return np.asarray(tile), (w, h)
+
+def difference_view(arrays):
+    """
+    Return the difference image of the first array against all others (largest channel
+    difference, stretched to full scale) and the fraction of changed pixels.
+    """
+    first = arrays[0].astype(np.int16)
+    diff = np.zeros(first.shape[:2], dtype=np.int16)
+    for array in arrays[1:]:
+        diff = np.maximum(diff, np.abs(array.astype(np.int16) - first).max(axis=2))
+    changed = float((diff > DIFF_THRESHOLD).mean())
+    peak = int(diff.max())
+    if peak:
+        diff = diff * (255.0 / peak)
+    return diff.astype(np.uint8), changed
+
+def compare_worker(requests, results):
+    """Worker thread: render the latest requested view of all images until None is requested."""
+    cache = OrderedDict()
+    while True:
+        request = requests.get()
+        # Skip views that were superseded while the last one was rendered.
+        while not requests.empty():
+            request = requests.get()
+        if request is None:
+            return
+        paths, view = request
+        try:
+            rendered = [render_view(cache, path, view, COMPARE_CANVAS_SIZE) for path in paths]
+            arrays = [array for array, _ in rendered]
+            diff = difference_view(arrays) if len(arrays) > 1 else (None, 0.0)
+            results.put((paths, arrays, diff, rendered[0][1], None))
+        except Exception as e:
+            results.put((paths, None, None, None, str(e)))
+
+def open_compare_dialog():
+    """Open a window comparing one plot across two or more run folders."""
+    folders = list_run_folders()
+    if len(folders) < 2:
+        messagebox.showinfo("Compare Runs", "At least two run folders are needed in EZCONPNG_FILES.")
+        return
+    cmp_win = tk.Toplevel(root)
+    cmp_win.title("Compare Runs")
+    cmp_win.geometry("1200x800")
+
+    requests = queue.Queue()
+    results = queue.Queue()
+    threading.Thread(target=compare_worker, args=(requests, results), daemon=True).start()
+    state = {"view": (0.5, 0.5, 1.0), "paths": [], "image_size": None, "photos": [], "drag": None}
+
+    top = tk.Frame(cmp_win)
+    top.pack(fill=tk.X, padx=5, pady=5)
+    tk.Label(top, text="Run folders:").pack(side=tk.LEFT, anchor=tk.N)
+    folder_list = tk.Listbox(top, selectmode=tk.MULTIPLE, exportselection=False, height=6, width=25)
+    for folder in folders:
+        folder_list.insert(tk.END, folder)
+    folder_list.pack(side=tk.LEFT, padx=5)
+    tk.Label(top, text="Plot:").pack(side=tk.LEFT, anchor=tk.N)
+    plot_var = tk.StringVar()
+    plot_combo = ttk.Combobox(top, textvariable=plot_var, state="readonly", width=35)
+    plot_combo.pack(side=tk.LEFT, padx=5, anchor=tk.N)
+    tk.Button(top, text="Reset View", command=lambda: set_view((0.5, 0.5, 1.0))).pack(side=tk.LEFT, padx=5, anchor=tk.N)
+    status_var = tk.StringVar(value="Select two or more run folders and a plot.")
+    tk.Label(cmp_win, textvariable=status_var, anchor="w").pack(fill=tk.X, padx=5)
+
+    view_frame = tk.Frame(cmp_win)
+    view_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+    canvases = []
+
+    def selected_folders():
+        return [folders[i] for i in folder_list.curselection()]
+
+    def on_folders_changed(event=None):
+        names = common_plots(selected_folders())
+        plot_combo["values"] = names
+        if plot_var.get() not in names:
+            plot_var.set(names[0] if names else "")
         else:
-            moved_files = []
-            if output_folder:
-                for f in os.listdir(WORKING_DIR):
-                    if f.lower().endswith(".png"):
-                        fpath = os.path.join(WORKING_DIR, f)
-                        try:
-                            if os.path.getmtime(fpath) >= run_start_time:
-                                shutil.move(fpath, os.path.join(output_folder, f))
-                                moved_files.append(f)
-                        except Exception as e:
-                            log_debug("Error moving file " + f + ": " + str(e))
-                log_debug("Moved .png files: " + ", ".join(moved_files))
-            messagebox.showinfo("ezCon Output",
-                                "ezCon.py completed successfully.\nCheck debug output for details.")
-            update_thumbnails()
+            on_plot_changed()
+
+    def build_canvases(count):
+        for canvas in canvases:
+            canvas.master.destroy()
+        canvases.clear()
+        titles = selected_folders() + ["Difference"]
+        for i in range(count):
+            frame = tk.Frame(view_frame)
+            frame.grid(row=i // 3, column=i % 3, padx=3, pady=3)
+            tk.Label(frame, text=titles[i] if i < len(titles) else "").pack()
+            canvas = tk.Canvas(frame, width=COMPARE_CANVAS_SIZE[0], height=COMPARE_CANVAS_SIZE[1], bg="gray")
+            canvas.pack()
+            canvas.bind("<ButtonPress-1>", on_press)
+            canvas.bind("<B1-Motion>", on_drag)
+            canvas.bind("<MouseWheel>", lambda e: on_zoom(e, 1 if e.delta > 0 else -1))
+            canvas.bind("<Button-4>", lambda e: on_zoom(e, 1))
+            canvas.bind("<Button-5>", lambda e: on_zoom(e, -1))
+            canvases.append(canvas)
+
+    def on_plot_changed(*args):
+        folder_names = selected_folders()
+        output_root = os.path.join(WORKING_DIR, "EZCONPNG_FILES")
+        if len(folder_names) < 2 or not plot_var.get():
+            return
+        state["paths"] = [os.path.join(output_root, f, plot_var.get()) for f in folder_names]
+        build_canvases(len(folder_names) + 1)
+        set_view((0.5, 0.5, 1.0))
+
+    def set_view(view):
+        state["view"] = view
+        if state["paths"]:
+            requests.put((list(state["paths"]), view))
+
+    def view_scale():
+        w, h = state["image_size"] or COMPARE_CANVAS_SIZE
+        return min(COMPARE_CANVAS_SIZE[0] / w, COMPARE_CANVAS_SIZE[1] / h) * state["view"][2], w, h
+
+    def on_press(event):
+        state["drag"] = (event.x, event.y)
+
+    def on_drag(event):
+        if state["drag"] is None:
+            return
+        scale, w, h = view_scale()
+        cx, cy, zoom = state["view"]
+        dx, dy = event.x - state["drag"][0], event.y - state["drag"][1]
+        state["drag"] = (event.x, event.y)
+        set_view((cx - dx / scale / w, cy - dy / scale / h, zoom))
+
+    def on_zoom(event, direction):
+        scale, w, h = view_scale()
+        cx, cy, zoom = state["view"]
+        # Keep the image point under the cursor in place.
+        px = cx + (event.x - COMPARE_CANVAS_SIZE[0] / 2) / scale / w
+        py = cy + (event.y - COMPARE_CANVAS_SIZE[1] / 2) / scale / h
+        factor = 1.25 if direction > 0 else 1 / 1.25
+        new_zoom = min(64.0, max(0.25, zoom * factor))
+        factor = new_zoom / zoom
+        set_view((px - (px - cx) / factor, py - (py - cy) / factor, new_zoom))
+
+    def poll_results():
+        if not cmp_win.winfo_exists():
+            return
+        latest = None
+        while not results.empty():
+            latest = results.get()
+        if latest is not None:
+            paths, arrays, diff, image_size, error = latest
+            if error:
+                status_var.set("Error: " + error)
+            elif paths == state["paths"] and len(canvases) == len(arrays) + 1:
+                state["image_size"] = image_size
+                state["photos"] = [ImageTk.PhotoImage(Image.fromarray(a)) for a in arrays]
+                state["photos"].append(ImageTk.PhotoImage(Image.fromarray(diff[0])))
+                for canvas, photo in zip(canvases, state["photos"]):
+                    canvas.delete("all")
+                    canvas.create_image(0, 0, image=photo, anchor="nw")
+                status_var.set(f"Zoom {state['view'][2]:.2f}x, {diff[1] * 100:.2f}% of visible pixels differ")
+        cmp_win.after(30, poll_results)
+
+    def on_close():
+        requests.put(None)
+        cmp_win.destroy()
+
+    folder_list.bind("<<ListboxSelect>>", on_folders_changed)
+    plot_var.trace_add("write", on_plot_changed)
+    cmp_win.protocol("WM_DELETE_WINDOW", on_close)
+    poll_results()
+
+# ---------------- Remote Status Server ----------------
+# Optional HTTP server (stdlib only) for checking batch progress from another machine.
+# Requests are answered from status_snapshot, refreshed once a second on the Tk thread,
+# and from thumbnails cached when the GUI updates its own, so polling never touches
+# the running jobs or the disk.
+STATUS_REFRESH_MS = 1000
+STATUS_THUMBNAIL_SIZE = (320, 320)
+status_server_active = False
+status_server_host = "127.0.0.1"  # Use 0.0.0.0 to listen on all interfaces
+status_server_port = 8765
+status_server = None
+status_lock = threading.Lock()
+status_snapshot = {}
+status_thumbnails = {}          # Thumbnail file name -> PNG bytes
+log_tail = deque(maxlen=500)    # Recent debug window lines
+run_metrics = {"started": time.time(), "jobs_finished": 0, "jobs_failed": 0, "job_seconds": 0.0}
+
+STATUS_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>ezCon GUI status</title>
+<style>body{font-family:sans-serif;margin:1em}td,th{padding:2px 8px;text-align:left}
+pre{background:#eee;padding:4px;max-height:20em;overflow:auto}img{margin:4px;border:1px solid #ccc}</style>
+</head><body>
+<h2>ezCon GUI status</h2>
+<div id="summary"></div>
+<table id="jobs"></table>
+<h3>Latest plots</h3><div id="thumbs"></div>
+<h3>Log</h3><pre id="log"></pre>
+<script>
+function row(tag, values) {
+  const tr = document.createElement("tr");
+  for (const value of values) {
+    const cell = document.createElement(tag);
+    cell.textContent = String(value);
+    tr.appendChild(cell);
+  }
+  return tr;
+}
+async function refresh() {
+  const s = await (await fetch("/api/status")).json();
+  const m = s.metrics;
+  document.getElementById("summary").textContent =
+    `Running ${s.running.length}, pending ${s.pending}, batch remaining ${s.batch_remaining}, ` +
+    `finished ${m.jobs_finished} (${m.jobs_failed} failed), free memory ${m.available_mb ?? "?"} MB, load ${m.load ?? "?"}`;
+  // File names come from disk, so the DOM is built with textContent, never innerHTML.
+  const jobs = document.getElementById("jobs");
+  jobs.replaceChildren(row("th", ["Data file", "Elapsed s", "Progress", "Peak MB"]));
+  for (const j of s.running)
+    jobs.appendChild(row("td", [j.data_file, j.elapsed,
+      j.progress === null ? "?" : Math.round(j.progress * 100) + "%", j.peak_mb]));
+  document.getElementById("thumbs").replaceChildren(...s.thumbnails.map(t => {
+    const img = document.createElement("img");
+    img.setAttribute("src", `/thumbs/${encodeURIComponent(t)}?v=${s.thumbnails_version}`);
+    img.setAttribute("title", t);
+    return img;
+  }));
+  const log = await (await fetch("/api/log?lines=50")).json();
+  document.getElementById("log").textContent = log.lines.join("\\n");
+}
+refresh(); setInterval(refresh, 5000);
+</script></body></html>
+"""
+
+def cache_status_thumbnail(fname, img):
+    """Keep a PNG thumbnail of img for the status page. Called from update_thumbnails()."""
+    web_img = img.copy()
+    web_img.thumbnail(STATUS_THUMBNAIL_SIZE)
+    buffer = io.BytesIO()
+    web_img.save(buffer, format="PNG")
+    with status_lock:
+        status_thumbnails[fname] = buffer.getvalue()
+        status_snapshot["thumbnails_version"] = status_snapshot.get("thumbnails_version", 0) + 1
+
+def job_progress(job, now):
+    """Estimate the progress of a running job from the learned seconds per input MB."""
+    sec_per_mb = job_stats.get("sec_per_input_mb")
+    if not sec_per_mb:
+        return None
+    expected = sec_per_mb * max(0.1, job["input_size"] / (1024 * 1024))
+    return round(min(0.99, (now - job["start_time"]) / expected), 2)
+
+def refresh_status_snapshot():
+    """Copy the queue, job and metrics state for the status server. Runs on the Tk thread."""
+    root.after(STATUS_REFRESH_MS, refresh_status_snapshot)
+    if not status_server:
+        return
+    now = time.time()
+    running = [{"data_file": os.path.basename(job["cmd"][2]), "cmd": job["cmd"], "pid": job["pid"],
+                "elapsed": round(now - job["start_time"]), "progress": job_progress(job, now),
+                "estimate_mb": round(job["estimate_mb"]), "peak_mb": round(job["peak_mb"])}
+               for job in running_jobs]
+    load = load_average()
+    available = available_memory_mb()
+    metrics = dict(run_metrics)
+    metrics.update(uptime=round(now - run_metrics["started"]),
+                   average_job_seconds=round(run_metrics["job_seconds"] / max(1, run_metrics["jobs_finished"] - run_metrics["jobs_failed"]), 1),
+                   available_mb=round(available) if available is not None else None,
+                   load=round(load, 2) if load is not None else None,
+                   max_parallel_jobs=max_parallel_jobs,
+                   scheduler_delay_ms=scheduler_delay_ms)
+    with status_lock:
+        status_snapshot.update(
+            time=datetime.now().isoformat(timespec="seconds"),
+            running=running,
+            pending=len(pending_jobs),
+            batch_remaining=batch_remaining,
+            batch_results=dict(batch_results),
+            last_output_folder=last_output_folder,
+            metrics=metrics,
+            thumbnails=sorted(status_thumbnails))
+
+class StatusRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the status page, the JSON API and the cached thumbnails."""
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        if url.path in ("/", "/index.html"):
+            self.send_body(STATUS_PAGE.encode("utf-8"), "text/html; charset=utf-8")
+        elif url.path == "/api/status":
+            with status_lock:
+                body = json.dumps(status_snapshot)
+            self.send_body(body.encode("utf-8"), "application/json")
+        elif url.path == "/api/metrics":
+            with status_lock:
+                body = json.dumps(status_snapshot.get("metrics", {}))
+            self.send_body(body.encode("utf-8"), "application/json")
+        elif url.path == "/api/log":
+            try:
+                lines = max(1, min(len(log_tail) or 1, int(query.get("lines", ["100"])[0])))
+            except ValueError:
+                lines = 100
+            with status_lock:
+                tail = list(log_tail)[-lines:]
+            self.send_body(json.dumps({"lines": tail}).encode("utf-8"), "application/json")
+        elif url.path.startswith("/thumbs/"):
+            with status_lock:
+                data = status_thumbnails.get(urllib.parse.unquote(url.path[len("/thumbs/"):]))
+            if data is None:
+                self.send_error(404)
+            else:
+                self.send_body(data, "image/png")
+        else:
+            self.send_error(404)
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_status_server():
+    """Start the status server on status_server_host:status_server_port."""
+    global status_server
+    stop_status_server()
+    try:
+        status_server = http.server.ThreadingHTTPServer((status_server_host, status_server_port), StatusRequestHandler)
+        status_server.daemon_threads = True
+    except Exception as e:
+        status_server = None
+        log_debug("Error starting status server: " + str(e))
+        return
+    threading.Thread(target=status_server.serve_forever, name="status-server", daemon=True).start()
+    log_debug(f"Status server running at http://{status_server_host}:{status_server_port}/")
+
+def stop_status_server():
+    global status_server
+    if status_server:
+        server, status_server = status_server, None
+        threading.Thread(target=server.shutdown, daemon=True).start()
+        log_debug("Status server stopped.")
+
+def open_status_server_dialog():
+    """Open a window to enable the status server and set its interface and port."""
+    srv_win = tk.Toplevel(root)
+    srv_win.title("Status Web Server")
+    srv_win.grab_set()
+    active_var = tk.BooleanVar(value=status_server_active)
+    host_var = tk.StringVar(value=status_server_host)
+    port_var = tk.StringVar(value=str(status_server_port))
+    tk.Checkbutton(srv_win, text="Enable status web server", variable=active_var).grid(row=0, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+    tk.Label(srv_win, text="Interface (0.0.0.0 for all):", anchor="w").grid(row=1, column=0, sticky="w", padx=5)
+    tk.Entry(srv_win, textvariable=host_var, width=20).grid(row=1, column=1, padx=5, pady=2)
+    tk.Label(srv_win, text="Port:", anchor="w").grid(row=2, column=0, sticky="w", padx=5)
+    tk.Entry(srv_win, textvariable=port_var, width=20).grid(row=2, column=1, padx=5, pady=2)
+
+    def on_ok():
+        global status_server_active, status_server_host, status_server_port
+        if not port_var.get().strip().isdigit():
+            messagebox.showerror("Status Web Server", "The port must be a number.", parent=srv_win)
+            return
+        status_server_active = active_var.get()
+        status_server_host = host_var.get().strip() or "127.0.0.1"
+        status_server_port = int(port_var.get().strip())
+        srv_win.destroy()
+        if status_server_active:
+            start_status_server()
+        else:
+            stop_status_server()
+    btn_frame = tk.Frame(srv_win)
+    btn_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=5)
+    tk.Button(btn_frame, text="OK", command=on_ok, width=10).pack(side=tk.LEFT, padx=5)
+    tk.Button(btn_frame, text="Cancel", command=srv_win.destroy, width=10).pack(side=tk.RIGHT, padx=5)
+
+# ---------------- Sky Coverage Planner ----------------
+# For a fixed antenna azimuth/elevation the beam drifts across the sky. The planner
+# converts the beam direction to Galactic coordinates over a dense time grid in one
+# vectorized astropy transform, finds when it crosses the requested Galactic longitudes
+# and latitudes, and proposes the matching -ezConGalCrossing options and recording windows.
+PLANNER_MAX_SAMPLES = 200000
 
-    threading.Thread(target=wait_for_process).start()
+@functools.lru_cache(maxsize=8)
+def beam_galactic_track(lat, lon, alt, az, el, start_iso, days, step_minutes):
+    """
+    Return (unix times, l, b) in degrees of the beam direction from start_iso over days,
+    sampled every step_minutes. The step is enlarged when the whole range would need more
+    than PLANNER_MAX_SAMPLES samples, so the range is always covered.
+    Results are cached, so changing only the targets is instant.
+    """
+    step_minutes = max(step_minutes, days * 1440 / (PLANNER_MAX_SAMPLES - 1))
+    count = int(days * 1440 / step_minutes + 1e-9) + 1
+    times = Time(start_iso, scale="utc") + np.arange(count) * step_minutes * u.min
+    location = EarthLocation(lat=lat*u.deg, lon=lon*u.deg, height=alt*u.m)
+    beam = SkyCoord(az=np.full(count, az)*u.deg, alt=np.full(count, el)*u.deg,
+                    frame=AltAz(obstime=times, location=location))
+    gal = beam.galactic
+    track = (times.unix, gal.l.wrap_at(360*u.deg).deg, gal.b.deg)
+    for array in track:
+        array.flags.writeable = False
+    return track
+
+def parse_linspace(text):
+    """Parse "start stop num" (as ezCon's ...CenterL options) or a single value into a list of centers."""
+    values = [float(v) for v in text.split()]
+    if len(values) == 3:
+        return list(np.linspace(values[0], values[1], num=int(values[2])))
+    if len(values) == 1:
+        return values
+    raise ValueError("expected 'start stop num' or one value: " + text)
+
+def find_crossings(times, values, center, near, wrap=False):
+    """
+    Return the crossings of values through center as (time, window start, window end),
+    where the window is the time the beam stays within near degrees of the center.
+    """
+    offset = values - center
+    if wrap:
+        offset = (offset + 180.0) % 360.0 - 180.0
+    # A sign change far from the center is the wrap from 360 to 0 degrees, not a crossing.
+    above = offset >= 0
+    steps = np.nonzero((above[:-1] != above[1:]) &
+                       (np.abs(offset[:-1]) < 90) & (np.abs(offset[1:]) < 90))[0]
+    close = np.abs(offset) <= near
+    crossings = []
+    for i in steps:
+        frac = offset[i] / (offset[i] - offset[i + 1]) if offset[i] != offset[i + 1] else 0.0
+        when = times[i] + frac * (times[i + 1] - times[i])
+        first = last = i
+        while first > 0 and close[first - 1]:
+            first -= 1
+        while last < len(close) - 1 and close[last + 1]:
+            last += 1
+        crossings.append((when, times[first], times[last]))
+    return crossings
+
+def merge_windows(windows):
+    """Merge overlapping (start, end) windows."""
+    merged = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(w) for w in merged]
+
+def propose_center_option(centers, crossed):
+    """Return the "start stop num" option value spanning the crossed centers, or None."""
+    indices = [i for i, c in enumerate(centers) if c in crossed]
+    if not indices:
+        return None
+    first, last = indices[0], indices[-1]
+    return f"{centers[first]:g} {centers[last]:g} {last - first + 1}"
+
+def plan_sky_coverage(defaults, start_iso, days, step_minutes, glon_text, glat_text, glon_near, glat_near):
+    """Compute the Galactic crossings of the beam. Returns a dict with the crossings, windows and options."""
+    times, l, b = beam_galactic_track(
+        float(defaults.get("-ezRAObsLat", "0")), float(defaults.get("-ezRAObsLon", "0")),
+        float(defaults.get("-ezRAObsAmsl", "0")), float(defaults.get("-ezColAzimuth", "0")),
+        float(defaults.get("-ezColElevation", "0")), start_iso, days, step_minutes)
+    plan = {"crossings": [], "windows": [], "options": {}, "requested_step_minutes": step_minutes,
+            "step_minutes": (times[1] - times[0]) / 60 if len(times) > 1 else step_minutes}
+    for key, text, values, near, wrap in (
+            ("-ezConGalCrossingGLonCenterL", glon_text, l, glon_near, True),
+            ("-ezConGalCrossingGLatCenterL", glat_text, b, glat_near, False)):
+        if not text.strip():
+            continue
+        centers = parse_linspace(text)
+        crossed = set()
+        for center in centers:
+            for when, start, end in find_crossings(times, values, center, near, wrap):
+                crossed.add(center)
+                plan["crossings"].append((when, "GLon" if wrap else "GLat", center, start, end))
+                plan["windows"].append((start, end))
+        option = propose_center_option(centers, crossed)
+        if option:
+            plan["options"][key] = option
+            plan["options"][key.replace("CenterL", "Near")] = f"{near:g}"
+    plan["crossings"].sort()
+    plan["windows"] = merge_windows(plan["windows"])
+    plan["l_range"] = (float(l.min()), float(l.max()))
+    plan["b_range"] = (float(b.min()), float(b.max()))
+    return plan
+
+def format_utc(unix_time):
+    return datetime.utcfromtimestamp(unix_time).strftime("%Y-%m-%d %H:%M")
+
+def open_sky_planner_dialog():
+    """Open the sky coverage planner window."""
+    plan_win = tk.Toplevel(root)
+    plan_win.title("Sky Coverage Planner")
+    plan_win.geometry("700x650")
+    defaults = read_defaults()
+
+    form = tk.Frame(plan_win, padx=5, pady=5)
+    form.pack(fill=tk.X)
+    fields = [
+        ("Start date (UTC, YYYY-MM-DD)", datetime.utcnow().strftime("%Y-%m-%d")),
+        ("Number of days", "1"),
+        ("Time step (minutes)", "1"),
+        ("GLon centers (start stop num)", advanced_options.get("-ezConGalCrossingGLonCenterL") or "0 330 12"),
+        ("GLon near (degrees)", advanced_options.get("-ezConGalCrossingGLonNear") or "2.7"),
+        ("GLat centers (start stop num)", advanced_options.get("-ezConGalCrossingGLatCenterL") or ""),
+        ("GLat near (degrees)", advanced_options.get("-ezConGalCrossingGLatNear") or "2.3"),
+    ]
+    field_vars = []
+    for row, (label, value) in enumerate(fields):
+        tk.Label(form, text=label + ":", width=30, anchor="w").grid(row=row, column=0, sticky="w")
+        var = tk.StringVar(value=value)
+        tk.Entry(form, textvariable=var, width=30).grid(row=row, column=1, padx=5, pady=1)
+        field_vars.append(var)
+    tk.Label(form, text=f"Beam: az {defaults.get('-ezColAzimuth', '?')}°, el {defaults.get('-ezColElevation', '?')}° "
+                        f"at {defaults.get('-ezRAObsName', 'observer')} (from ezDefaults.txt)",
+             fg="gray").grid(row=len(fields), column=0, columnspan=2, sticky="w")
+
+    result_text = tk.Text(plan_win, height=25, wrap=tk.NONE, state=tk.DISABLED)
+    state = {"plan": None}
+
+    def show(text):
+        result_text.config(state=tk.NORMAL)
+        result_text.delete("1.0", tk.END)
+        result_text.insert(tk.END, text)
+        result_text.config(state=tk.DISABLED)
+
+    def on_result(plan, error):
+        if not plan_win.winfo_exists():
+            return
+        compute_button.config(state=tk.NORMAL)
+        if error:
+            show("Error: " + error)
+            return
+        state["plan"] = plan
+        lines = [f"Beam covers GLon {plan['l_range'][0]:.1f} .. {plan['l_range'][1]:.1f}, "
+                 f"GLat {plan['b_range'][0]:.1f} .. {plan['b_range'][1]:.1f}"]
+        if plan["step_minutes"] > plan["requested_step_minutes"] * 1.001:
+            lines.append(f"Step enlarged to {plan['step_minutes']:.2f} min to stay within "
+                         f"{PLANNER_MAX_SAMPLES} samples.")
+        lines += ["", "Crossings (UTC):"]
+        for when, kind, center, start, end in plan["crossings"]:
+            lines.append(f"  {format_utc(when)}  {kind} {center:7.2f}   near {format_utc(start)} .. {format_utc(end)}")
+        if not plan["crossings"]:
+            lines.append("  none")
+        lines += ["", "Recording windows (UTC):"]
+        lines += [f"  {format_utc(start)} .. {format_utc(end)}" for start, end in plan["windows"]] or ["  none"]
+        lines += ["", "Proposed options:"]
+        lines += [f"  {key} {value}" for key, value in plan["options"].items()] or ["  none"]
+        show("\n".join(lines))
+
+    def compute():
+        try:
+            args = (defaults, field_vars[0].get().strip(), float(field_vars[1].get()),
+                    float(field_vars[2].get()), field_vars[3].get(), field_vars[5].get(),
+                    float(field_vars[4].get() or 0), float(field_vars[6].get() or 0))
+        except ValueError as e:
+            show("Error: " + str(e))
+            return
+        compute_button.config(state=tk.DISABLED)
+        show("Computing...")
+
+        def worker():
+            try:
+                call_in_ui(on_result, plan_sky_coverage(*args), None)
+            except Exception as e:
+                call_in_ui(on_result, None, str(e))
+        threading.Thread(target=worker, daemon=True).start()
+
+    def apply_options():
+        plan = state["plan"]
+        if not plan or not plan["options"]:
+            return
+        for key, value in plan["options"].items():
+            advanced_options[key] = value
+            advanced_options_active[key] = True
+        log_debug("Galactic crossing options set from the sky coverage planner.")
+        update_cmd_preview()
+
+    btn_frame = tk.Frame(plan_win)
+    btn_frame.pack(fill=tk.X, padx=5, pady=5)
+    compute_button = tk.Button(btn_frame, text="Compute", command=compute, width=10)
+    compute_button.pack(side=tk.LEFT, padx=5)
+    tk.Button(btn_frame, text="Apply Proposed Options", command=apply_options).pack(side=tk.LEFT, padx=5)
+    tk.Button(btn_frame, text="Close", command=plan_win.destroy, width=10).pack(side=tk.RIGHT, padx=5)
+    result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+# ---------------- RFI Pre-screen ----------------
+# A quick NumPy look at an ezCol data file before running ezCon, suggesting the pluck,
+# FreqBinHide and FreqBinSmooth options that otherwise take several trial runs.
+# Data lines are a UTC timestamp followed by one power value per frequency bin;
+# a line with a non-numeric marker (e.g. REF) is a reference sample.
+TIMESTAMP_RE = re.compile(r'^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}:\d{2}(\.\d+)?)?$')
+OUTLIER_Z_LIMIT = 5.0      # Robust z-score of a sample's average power counted as outlier
+SPIKE_RATIO = 1.2          # Bin over its 4 neighbours' average counted as spike
+SPIKE_PERSISTENT_FRAC = 0.5  # Fraction of samples a bin must spike in to be hidden
+SATURATED_BIN_FRAC = 0.1   # Fraction of bins at the file's maximum counted as saturated
+GAP_FACTOR = 3.0           # Time step over the median step counted as dropped samples
+
+def parse_ezcol_file(path):
+    """
+    Read an ezCol .txt data file. Return (times, spectra, is_ref, bad_lines): times as unix
+    seconds (NaN if unreadable), spectra as a samples x bins array, is_ref as a bool array,
+    and the line numbers of data lines with an unexpected number of values.
+    """
+    times, rows, ref_flags, line_numbers = [], [], [], []
+    with open(path, "r", errors="replace") as f:
+        for line_number, line in enumerate(f, 1):
+            tokens = line.split()
+            if not tokens or not tokens[0][:1].isdigit():
+                continue
+            stamp_len = timestamp_tokens(tokens)
+            if not stamp_len:
+                continue
+            try:
+                stamp = datetime.fromisoformat(" ".join(tokens[:stamp_len]).replace(" ", "T"))
+                times.append(stamp.replace(tzinfo=timezone.utc).timestamp())
+            except ValueError:
+                times.append(float("nan"))
+            values = [t for t in tokens[stamp_len:] if t[:1].isdigit() or t[:1] in "-+."]
+            ref_flags.append(len(values) != len(tokens) - stamp_len)
+            rows.append(values)
+            line_numbers.append(line_number)
+    if not rows:
+        raise ValueError("No ezCol data lines found in " + path)
+    counts = [len(r) for r in rows]
+    bins = max(set(counts), key=counts.count)
+    keep = [i for i, c in enumerate(counts) if c == bins]
+    bad_lines = [line_numbers[i] for i, c in enumerate(counts) if c != bins]
+    spectra = np.array([rows[i] for i in keep], dtype=float)
+    return (np.array([times[i] for i in keep]), spectra,
+            np.array([ref_flags[i] for i in keep], dtype=bool), bad_lines)
+
+def neighbour_ratio(spectra):
+    """
+    Return each bin divided by the average of its 4 neighbouring bins (2 each side) in the
+    same sample, as -ezConAntFreqBinSmooth compares them. The 2 edge bins at each side are 1.
+    """
+    ratio = np.ones_like(spectra)
+    if spectra.shape[1] < 5:
+        return ratio
+    neighbours = (spectra[:, :-4] + spectra[:, 1:-3] + spectra[:, 3:-1] + spectra[:, 4:]) / 4.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio[:, 2:-2] = np.where(neighbours > 0, spectra[:, 2:-2] / neighbours, 1.0)
+    return ratio
+
+def prescreen_data(path):
+    """Analyse an ezCol data file. Return a dict with the findings and suggested options."""
+    times, raw, is_ref, bad_lines = parse_ezcol_file(path)
+    ant = raw[~is_ref]
+    ant_times = times[~is_ref]
+    report = {"raw_samples": len(raw), "ant_samples": len(ant), "bins": raw.shape[1],
+              "bad_lines": bad_lines, "suggestions": {}}
+    if len(ant) < 3:
+        report["notes"] = ["Too few Ant samples to analyse."]
+        return report
+    notes = []
+
+    # Dead, flat and saturated samples.
+    dead = ~np.isfinite(ant).all(axis=1) | (np.nan_to_num(ant) <= 0).all(axis=1)
+    flat = np.ptp(np.nan_to_num(ant), axis=1) == 0
+    peak = np.nanmax(ant)
+    saturated = (ant >= peak).mean(axis=1) >= SATURATED_BIN_FRAC
+    bad = dead | flat | saturated
+    report["dead"] = np.nonzero(dead | flat)[0].tolist()
+    report["saturated"] = np.nonzero(saturated & ~(dead | flat))[0].tolist()
+
+    # Dropped samples: time gaps much longer than the usual step.
+    steps = np.diff(ant_times)
+    steps = steps[np.isfinite(steps)]
+    if len(steps):
+        usual = np.median(steps)
+        gaps = np.nonzero(np.diff(ant_times) > GAP_FACTOR * usual)[0] if usual > 0 else []
+        report["gaps"] = [(int(i), float(ant_times[i + 1] - ant_times[i])) for i in gaps]
+    if bad.all():
+        report["notes"] = ["All Ant samples are dead, flat or saturated; nothing to suggest."]
+        return report
+
+    # Bad samples at the start and end are cut off with -ezConAntSamplesUseL.
+    first = 0
+    while first < len(ant) and bad[first]:
+        first += 1
+    last = len(ant) - 1
+    while last > first and bad[last]:
+        last -= 1
+    used = np.zeros(len(ant), dtype=bool)
+    used[first:last + 1] = True
+
+    # Samples with outlying average power, by robust z-score over the good samples.
+    avg = np.nanmean(np.where(np.isfinite(ant), ant, np.nan), axis=1)
+    good_avg = avg[~bad & np.isfinite(avg)]
+    median = np.median(good_avg)
+    mad = np.median(np.abs(good_avg - median)) * 1.4826 or 1e-12
+    z = (np.nan_to_num(avg, nan=-np.inf) - median) / mad
+    low = int((((z < -OUTLIER_Z_LIMIT) | dead | flat) & used).sum())
+    high = int(((z > OUTLIER_Z_LIMIT) & ~(dead | flat) & used).sum())
+    report["avg_low"], report["avg_high"] = low, high
+
+    # Frequency bins spiking over their neighbours.
+    ratio = neighbour_ratio(np.nan_to_num(ant[~bad]))
+    spike_frac = (ratio > SPIKE_RATIO).mean(axis=0)
+    spiky = np.nonzero(spike_frac >= SPIKE_PERSISTENT_FRAC)[0]
+    report["spiky_bins"] = spiky.tolist()
+    clean = np.delete(ratio, spiky, axis=1) if len(spiky) else ratio
+    smooth = max(1.01, np.ceil(np.percentile(clean, 99.9) * 100) / 100)
+
+    # Suggestions, in the form the Advanced Options expect.
+    suggestions = report["suggestions"]
+    if first > 0 or last < len(ant) - 1:
+        suggestions["-ezConAntSamplesUseL"] = f"{first} {last}"
+    inner_bad = np.nonzero(bad & used)[0].tolist()
+    if len(inner_bad) == 1 and low + high <= 1:
+        suggestions["-ezConAntPluck"] = str(inner_bad[0])
+    elif low or high:
+        if max(low, high) <= 10:
+            suggestions["-ezConAntAvgPluckQtyL"] = f"{low} {high}"
+        else:
+            suggestions["-ezConAntAvgPluckFracL"] = f"{np.ceil(low / len(ant) * 1000) / 1000:g} {np.ceil(high / len(ant) * 1000) / 1000:g}"
+    if len(spiky):
+        worst = int(spiky[np.argmax(spike_frac[spiky])])
+        suggestions["-ezConRawFreqBinHide"] = str(worst)
+        if len(spiky) > 1:
+            notes.append(f"{len(spiky)} spiky bins, -ezConRawFreqBinHide can hide only one ({worst}).")
+    # Ordinary noise stays far below SPIKE_RATIO; a spur limiter is only worth it with spurs.
+    if len(spiky) or (clean > SPIKE_RATIO).any():
+        suggestions["-ezConAntFreqBinSmooth"] = f"{smooth:g}"
+    report["notes"] = notes
+    return report
+
+def format_prescreen_report(report):
+    lines = [f"Raw samples: {report['raw_samples']}, Ant samples: {report['ant_samples']}, freq bins: {report['bins']}"]
+    if report["bad_lines"]:
+        lines.append(f"Data lines with a wrong number of values: {len(report['bad_lines'])} (first at line {report['bad_lines'][0]})")
+    if "dead" in report:
+        lines.append("Dead or flat Ant samples: " + (" ".join(map(str, report["dead"][:30])) or "none"))
+        lines.append("Saturated Ant samples: " + (" ".join(map(str, report["saturated"][:30])) or "none"))
+        gaps = report.get("gaps", [])
+        lines.append("Time gaps (dropped samples): " +
+                     (", ".join(f"after {i} ({sec:.0f} s)" for i, sec in gaps[:10]) or "none"))
+    if "avg_low" in report:
+        lines.append(f"Average power outliers: {report['avg_low']} low, {report['avg_high']} high")
+        lines.append("Spiky freq bins: " + (" ".join(map(str, report["spiky_bins"][:30])) or "none"))
+    lines += report.get("notes", [])
+    return "\n".join(lines)
+
+def open_prescreen_dialog():
+    """Pre-screen the selected data file and offer its suggestions for the Advanced Options."""
+    data_file = file_entry.get().strip()
+    if not data_file or not os.path.exists(data_file):
+        messagebox.showerror("Error", "Please select a .txt data file first!")
+        return
+    scr_win = tk.Toplevel(root)
+    scr_win.title("RFI Pre-screen: " + os.path.basename(data_file))
+    scr_win.geometry("650x500")
+    report_text = tk.Text(scr_win, height=12, wrap=tk.WORD)
+    report_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+    report_text.insert(tk.END, "Analysing " + data_file + " ...")
+    report_text.config(state=tk.DISABLED)
+    suggestion_frame = tk.LabelFrame(scr_win, text="Suggested options", padx=5, pady=5)
+    suggestion_frame.pack(fill=tk.X, padx=5)
+    suggestion_vars = {}
+
+    def on_result(report, error):
+        if not scr_win.winfo_exists():
+            return
+        report_text.config(state=tk.NORMAL)
+        report_text.delete("1.0", tk.END)
+        report_text.insert(tk.END, "Error: " + error if error else format_prescreen_report(report))
+        report_text.config(state=tk.DISABLED)
+        if error:
+            return
+        for key, value in report["suggestions"].items():
+            row = tk.Frame(suggestion_frame)
+            row.pack(fill=tk.X)
+            use_var = tk.BooleanVar(value=True)
+            value_var = tk.StringVar(value=value)
+            suggestion_vars[key] = (use_var, value_var)
+            tk.Checkbutton(row, variable=use_var).pack(side=tk.LEFT)
+            tk.Label(row, text=key, width=30, anchor="w").pack(side=tk.LEFT)
+            tk.Entry(row, textvariable=value_var, width=20).pack(side=tk.LEFT, padx=5)
+        apply_button.config(state=tk.NORMAL)
+
+    def worker():
+        try:
+            call_in_ui(on_result, prescreen_data(data_file), None)
+        except Exception as e:
+            call_in_ui(on_result, None, str(e))
+    threading.Thread(target=worker, daemon=True).start()
+
+    def apply_suggestions():
+        for key, (use_var, value_var) in suggestion_vars.items():
+            if use_var.get() and value_var.get().strip():
+                advanced_options[key] = value_var.get().strip()
+                advanced_options_active[key] = True
+        log_debug("Advanced options pre-filled from the RFI pre-screen.")
+        scr_win.destroy()
+        update_cmd_preview()
+        open_advanced_options_dialog()
+
+    btn_frame = tk.Frame(scr_win)
+    btn_frame.pack(fill=tk.X, padx=5, pady=5)
+    apply_button = tk.Button(btn_frame, text="Apply to Advanced Options", command=apply_suggestions, state=tk.DISABLED)
+    apply_button.pack(side=tk.LEFT, padx=5)
+    tk.Button(btn_frame, text="Close", command=scr_win.destroy, width=10).pack(side=tk.RIGHT, padx=5)
 
 # ---------------- File Selection ----------------
 def select_file():
@@ -756,6 +3041,9 @@ def menu_about():
 def menu_advanced_options():
     open_advanced_options_dialog()
 
+def menu_plot_selection():
+    open_plot_selection_dialog()
+
 def menu_ezcon_help():
     # Open the Ezcon Help window without recursion
     help_win = tk.Toplevel(root)
@@ -784,18 +3072,26 @@ if os.path.exists(icon_path):
 
 # Create folder_style_var AFTER root is created.
 folder_style_var = tk.BooleanVar(root, value=False)
+optimize_png_var = tk.BooleanVar(root, value=False)
+auto_archive_var = tk.BooleanVar(root, value=False)
 
 # Top menu bar.
 menu_bar = tk.Menu(root)
 root.config(menu=menu_bar)
 file_menu = tk.Menu(menu_bar, tearoff=0)
 file_menu.add_command(label="Open Data File...", command=menu_open_file)
+file_menu.add_command(label="Run Batch Directory...", command=run_batch_directory)
+file_menu.add_command(label="Re-run from Manifests...", command=rerun_from_manifests)
 file_menu.add_command(label="Clear Debug", command=menu_clear_debug)
 file_menu.add_command(label="Reload Defaults", command=menu_reload_defaults)
 file_menu.add_command(label="Save Settings", command=menu_save_settings)
 file_menu.add_command(label="Save Settings As...", command=save_settings_as)
 file_menu.add_command(label="Load Settings", command=menu_load_settings)
 file_menu.add_separator()
+file_menu.add_command(label="Archive Old Runs...", command=menu_archive_old_runs)
+file_menu.add_command(label="Browse Archived Runs...", command=open_archive_browser)
+file_menu.add_command(label="Compare Runs...", command=open_compare_dialog)
+file_menu.add_separator()
 file_menu.add_command(label="Exit", command=menu_exit)
 menu_bar.add_cascade(label="File", menu=file_menu)
 
@@ -809,8 +3105,15 @@ if DEBUG_MODE:
 
 options_menu = tk.Menu(menu_bar, tearoff=0)
 options_menu.add_command(label="Advanced Options...", command=menu_advanced_options)
+options_menu.add_command(label="Plot Selection...", command=menu_plot_selection)
+options_menu.add_command(label="Parallel ezCon Jobs...", command=menu_max_parallel_jobs)
+options_menu.add_command(label="Status Web Server...", command=open_status_server_dialog)
+options_menu.add_command(label="Sky Coverage Planner...", command=open_sky_planner_dialog)
+options_menu.add_command(label="RFI Pre-screen...", command=open_prescreen_dialog)
 # Add the new checkbutton for folder style under Options.
 options_menu.add_checkbutton(label="Use ddmmyyyy folder style", variable=folder_style_var)
+options_menu.add_checkbutton(label="Optimize .png files after run", variable=optimize_png_var)
+options_menu.add_checkbutton(label="Archive old runs after run", variable=auto_archive_var)
 menu_bar.add_cascade(label="Options", menu=options_menu)
 
 help_menu = tk.Menu(menu_bar, tearoff=0)
@@ -831,6 +3134,8 @@ def change_working_dir():
     if new_dir:
         working_dir_var.set(new_dir)
         WORKING_DIR = new_dir
+        load_fingerprint_index()
+        load_job_stats()
         update_cmd_preview()
         log_debug("Working directory changed to: " + new_dir)
 tk.Button(working_dir_frame, text="Change", command=change_working_dir).pack(side=tk.LEFT, padx=5)
@@ -890,10 +3195,17 @@ debug_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 debug_text.config(yscrollcommand=debug_scrollbar.set)
 
 # ---------------- Initialization ----------------
+start_supervisor()
+process_ui_queue()
 load_settings()             # Automatically load settings at startup.
+load_fingerprint_index()
+load_job_stats()
 update_default_parameters()
 load_advanced_options()
 update_cmd_preview()
 update_thumbnails()
+if status_server_active:
+    start_status_server()
+refresh_status_snapshot()
 
 root.mainloop()